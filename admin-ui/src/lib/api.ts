@@ -323,11 +323,15 @@ export const adminApi = {
     template_version_id?: string;
     instance_id?: string;
     state?: string;
+    limit?: number;
+    offset?: number;
   }): Promise<Session[]> {
     const params = new URLSearchParams();
     if (filters?.template_version_id) params.append('template_version_id', filters.template_version_id);
     if (filters?.instance_id) params.append('instance_id', filters.instance_id);
     if (filters?.state) params.append('state', filters.state);
+    if (filters?.limit !== undefined) params.append('limit', String(filters.limit));
+    if (filters?.offset !== undefined) params.append('offset', String(filters.offset));
     const query = params.toString() ? `?${params.toString()}` : '';
     const res = await fetch(`${ADMIN_API_URL}/sessions${query}`);
     return res.json();
@@ -7,25 +7,40 @@ from alembic import context
 from sqlalchemy import create_engine, pool
 from sqlalchemy.engine import Connection
 
-from maruntime.persistence import Base
-
 config = context.config
 
-if config.config_file_name is not None:
-    fileConfig(config.config_file_name)
+# Programmatic callers (tests, in-process upgrades) set configure_logger=False
+# so repeated invocations do not rebuild the logging tree every time.
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+
+def _load_metadata():
+    # Importing the models builds the full Base.metadata; only online runs
+    # (upgrade/autogenerate) need it, offline SQL rendering does not.
+    from maruntime.persistence import Base
+
+    return Base.metadata
+
 
-target_metadata = Base.metadata
+# Async driver prefixes mapped to the sync drivers Alembic runs with.
+# PostgreSQL goes through psycopg 3, which pipelines executemany batches
+# instead of one round trip per row.
+_SYNC_URL_PREFIXES = (
+    ("postgresql+asyncpg://", "postgresql+psycopg://"),
+    ("postgresql://", "postgresql+psycopg://"),
+    ("sqlite+aiosqlite://", "sqlite://"),
+    ("mysql+aiomysql://", "mysql+pymysql://"),
+)
 
 
 def _get_url() -> str:
     url = config.get_main_option("sqlalchemy.url")
     if not url:
         url = os.getenv("DATABASE_URL", "sqlite:///./dev.db")
-    # Convert async URLs to sync for Alembic
-    if url.startswith("postgresql+asyncpg://"):
-        url = url.replace("postgresql+asyncpg://", "postgresql://")
-    if url.startswith("sqlite+aiosqlite://"):
-        url = url.replace("sqlite+aiosqlite://", "sqlite://")
+    for async_prefix, sync_prefix in _SYNC_URL_PREFIXES:
+        if url.startswith(async_prefix):
+            return sync_prefix + url[len(async_prefix):]
     return url
 
 
@@ -33,7 +48,7 @@ def run_migrations_offline() -> None:
     url = _get_url()
     context.configure(
         url=url,
-        target_metadata=target_metadata,
+        target_metadata=None,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
         compare_type=True,
@@ -43,15 +58,38 @@ def run_migrations_offline() -> None:
         context.run_migrations()
 
 
+def _check_server_version(connection: Connection) -> None:
+    # Migrations need PostgreSQL 13+: chat_turns is hash-partitioned and
+    # maintained by a row-level BEFORE trigger, which partitioned tables only
+    # accept from 13 on. (11+ fast defaults for ADD COLUMN ... DEFAULT ... NOT
+    # NULL are relied on as well.)
+    if connection.dialect.name != "postgresql":
+        return
+    version = connection.dialect.server_version_info or ()
+    if version and version < (13,):
+        raise RuntimeError(
+            f"PostgreSQL {'.'.join(map(str, version))} is not supported; upgrade to 13 or newer "
+            "before running migrations."
+        )
+
+
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata, compare_type=True)
+    _check_server_version(connection)
+    context.configure(connection=connection, target_metadata=_load_metadata(), compare_type=True)
 
     with context.begin_transaction():
         context.run_migrations()
 
 
 def run_migrations_online() -> None:
-    connectable = create_engine(_get_url(), poolclass=pool.NullPool)
+    # Callers that already hold a connection (e.g. an app's async engine via
+    # AsyncConnection.run_sync) pass it in instead of dialing a second one.
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        do_run_migrations(connection)
+        return
+
+    connectable = create_engine(_get_url(), poolclass=pool.NullPool, insertmanyvalues_page_size=1000)
 
     with connectable.connect() as connection:
         do_run_migrations(connection)
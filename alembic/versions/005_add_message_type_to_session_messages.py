@@ -37,12 +37,24 @@ def upgrade() -> None:
         sa.Column('step_data', sa.JSON, nullable=True)
     )
     
-    # Create index for faster queries by message_type
-    op.create_index('ix_session_messages_message_type', 'session_messages', ['message_type'])
+    # Plain 'message' rows dominate the table, so on PostgreSQL only the rare
+    # step rows are indexed, covering the "steps of a session" lookup.
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.execute(
+            "CREATE INDEX ix_session_messages_step ON session_messages (session_id, step_number) "
+            "INCLUDE (message_type) WHERE message_type <> 'message'"
+        )
+    else:
+        op.create_index('ix_session_messages_message_type', 'session_messages', ['message_type'])
 
 
 def downgrade() -> None:
-    op.drop_index('ix_session_messages_message_type')
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.drop_index('ix_session_messages_step', table_name='session_messages')
+    else:
+        op.drop_index('ix_session_messages_message_type', table_name='session_messages')
     op.drop_column('session_messages', 'step_data')
     op.drop_column('session_messages', 'step_number')
     op.drop_column('session_messages', 'message_type')
@@ -0,0 +1,38 @@
+"""Install the pg_trgm extension used by chat memory search.
+
+Revision ID: 005_install_pg_trgm
+Revises: 005_add_message_type
+Create Date: 2026-01-09
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "005_install_pg_trgm"
+down_revision: Union[str, None] = "005_add_message_type"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    if op.get_context().as_sql:
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        return
+    # Managed Postgres often restricts CREATE EXTENSION, and even the
+    # IF NOT EXISTS form takes a catalog lock. Look the extension up first so
+    # databases where a DBA installed it out-of-band skip the DDL entirely.
+    installed = bind.execute(sa.text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")).scalar()
+    if not installed:
+        op.execute("CREATE EXTENSION pg_trgm")
+
+
+def downgrade() -> None:
+    # The extension may be shared with other schemas; leave it installed.
+    pass
@@ -1,10 +1,12 @@
 """Add chat_turns table for chat memory search.
 
 Revision ID: 006_add_chat_turns
-Revises: 005_add_message_type
+Revises: 005_install_pg_trgm
 Create Date: 2026-01-09
 """
 
+import os
+import string
 from typing import Sequence, Union
 
 from alembic import op
@@ -14,83 +16,144 @@ from sqlalchemy.dialects import postgresql
 
 # revision identifiers, used by Alembic.
 revision: str = "006_add_chat_turns"
-down_revision: Union[str, None] = "005_add_message_type"
+down_revision: Union[str, None] = "005_install_pg_trgm"
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
-def _create_postgres() -> None:
-    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+CHAT_TURNS_PARTITIONS = 16
+
+# Everything the old '[^[:alnum:][:space:]]' regex blanked out in practice:
+# ASCII punctuation plus the quotes, dashes and symbols common in Russian text.
+# translate() maps each of them to a space.
+_NORM_PUNCTUATION = string.punctuation + "«»„“”‘’‚‹›—–‒…•·№§°±×÷¶©®™€£¥¢¡¿‰†‡′″"
+
+_SEARCH_TRIGGER_FUNCTION = rf"""
+CREATE OR REPLACE FUNCTION chat_turns_search_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE'
+       AND NEW.user_text IS NOT DISTINCT FROM OLD.user_text
+       AND NEW.assistant_text IS NOT DISTINCT FROM OLD.assistant_text THEN
+        RETURN NEW;
+    END IF;
+    NEW.search_text := coalesce(NEW.user_text, '') || E'\n\n' || coalesce(NEW.assistant_text, '');
+    -- translate() is a per-character table lookup; unlike the old regex it
+    -- leaves runs of spaces, which trigram similarity ignores anyway.
+    NEW.search_text_norm := lower(translate(NEW.search_text, '{_NORM_PUNCTUATION.replace("'", "''")}', '{" " * len(_NORM_PUNCTUATION)}'));
+    -- One weighted vector: user text ranks above assistant text (A over B).
+    -- ChatMemoryService passes explicit ts_rank_cd weights for these labels.
+    NEW.search_tsv := setweight(to_tsvector('russian', coalesce(NEW.user_text, '')), 'A')
+        || setweight(to_tsvector('russian', coalesce(NEW.assistant_text, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
 
+
+def _create_postgres() -> None:
+    # Hash-partitioned by owner so a per-user search only walks one
+    # partition's (much shorter) GIN posting lists. The partition key has to
+    # be part of the primary key.
     op.create_table(
         "chat_turns",
-        sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
         sa.Column(
             "user_id",
             sa.String(36),
             sa.ForeignKey("users.id", ondelete="CASCADE"),
             nullable=False,
-            index=True,
         ),
         sa.Column(
             "chat_id",
             sa.String(36),
             sa.ForeignKey("sessions.id", ondelete="CASCADE"),
             nullable=False,
-            index=True,
         ),
         sa.Column("turn_index", sa.Integer(), nullable=False),
         sa.Column("user_text", sa.Text(), nullable=False, server_default=""),
         sa.Column("assistant_text", sa.Text(), nullable=True),
         sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
-        sa.Column(
-            "search_text",
-            sa.Text(),
-            sa.Computed(
-                "coalesce(user_text,'') || E'\\n\\n' || coalesce(assistant_text,'')",
-                persisted=True,
-            ),
-        ),
-        sa.Column(
-            "search_text_norm",
-            sa.Text(),
-            sa.Computed(
-                "lower(regexp_replace(coalesce(user_text,'') || E'\\n\\n' || coalesce(assistant_text,''), "
-                "'[^[:alnum:][:space:]]+', ' ', 'g'))",
-                persisted=True,
-            ),
-        ),
-        sa.Column(
-            "search_tsv",
-            postgresql.TSVECTOR(),
-            sa.Computed(
-                "to_tsvector('russian', coalesce(user_text,'') || E'\\n\\n' || coalesce(assistant_text,''))",
-                persisted=True,
-            ),
-        ),
+        sa.Column("search_text", sa.Text(), nullable=True),
+        sa.Column("search_text_norm", sa.Text(), nullable=True),
+        sa.Column("search_tsv", postgresql.TSVECTOR(), nullable=True),
+        sa.PrimaryKeyConstraint("id", "user_id", name="chat_turns_pkey"),
         sa.UniqueConstraint("user_id", "chat_id", "turn_index", name="uq_chat_turns_order"),
+        postgresql_partition_by="HASH (user_id)",
     )
-
-    op.create_index(
-        "ix_chat_turns_owner_chat_pos",
-        "chat_turns",
-        ["user_id", "chat_id", "turn_index"],
-    )
-    op.create_index(
-        "gin_chat_turns_search_tsv",
-        "chat_turns",
-        ["search_tsv"],
-        postgresql_using="GIN",
+    for remainder, partition in enumerate(_partition_names()):
+        op.execute(
+            f"CREATE TABLE {partition} PARTITION OF chat_turns "
+            f"FOR VALUES WITH (MODULUS {CHAT_TURNS_PARTITIONS}, REMAINDER {remainder})"
+        )
+
+    # Search columns are maintained by a trigger rather than STORED generated
+    # columns, so the tsvector and normalisation work only runs when the texts change.
+    # Row-level triggers on a partitioned table need PostgreSQL 13+, which
+    # env.py checks before any migration runs.
+    op.execute(_SEARCH_TRIGGER_FUNCTION)
+    op.execute(
+        """
+        CREATE TRIGGER trg_chat_turns_search
+        BEFORE INSERT OR UPDATE OF user_text, assistant_text ON chat_turns
+        FOR EACH ROW EXECUTE FUNCTION chat_turns_search_update()
+        """
     )
-    op.create_index(
-        "gin_chat_turns_search_trgm",
-        "chat_turns",
-        ["search_text_norm"],
-        postgresql_using="GIN",
-        postgresql_ops={"search_text_norm": "gin_trgm_ops"},
+
+
+def _partition_names() -> list[str]:
+    return [f"chat_turns_p{i}" for i in range(CHAT_TURNS_PARTITIONS)]
+
+
+def _rum_available() -> bool:
+    if op.get_context().as_sql:
+        # Offline SQL scripts cannot probe the catalog; emit the portable GIN.
+        return False
+    bind = op.get_bind()
+    return bool(
+        bind.execute(sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'rum'")).scalar()
     )
 
 
+def _create_partitioned_index(name: str, columns: str, *, using: str = "btree", options: str = "") -> None:
+    # Partitioned parents reject CREATE INDEX CONCURRENTLY. Create the parent
+    # index ON ONLY (left invalid), build each partition's index concurrently,
+    # then attach them; the parent index turns valid once all are attached.
+    op.execute(f"CREATE INDEX {name} ON ONLY chat_turns USING {using} ({columns}){options}")
+    for partition in _partition_names():
+        child = f"{partition}_{name}"
+        op.execute(f"CREATE INDEX CONCURRENTLY {child} ON {partition} USING {using} ({columns}){options}")
+        op.execute(f"ALTER INDEX {name} ATTACH PARTITION {child}")
+
+
+def _create_postgres_indexes() -> None:
+    # Built after the table is populated so Postgres sorts once instead of
+    # maintaining btree/GIN pages row by row during a bulk load. CONCURRENTLY
+    # keeps chat_turns writable while the indexes build; it cannot run inside
+    # a transaction, hence the autocommit block.
+    with op.get_context().autocommit_block():
+        _create_partitioned_index("ix_chat_turns_user_id", "user_id")
+        _create_partitioned_index("ix_chat_turns_chat_id", "chat_id")
+        _create_partitioned_index("ix_chat_turns_owner_chat_pos", "user_id, chat_id, turn_index")
+        # chat_turns is append-only, so created_at follows physical order and a
+        # tiny BRIN index is enough to prune time-window scans.
+        _create_partitioned_index(
+            "brin_chat_turns_created", "created_at", using="brin", options=" WITH (pages_per_range = 32)"
+        )
+        if _rum_available():
+            # RUM keeps lexeme positions in the index, so ranked top-k lookups
+            # (ORDER BY search_tsv <=> tsq LIMIT k) avoid a heap fetch per match.
+            op.execute("CREATE EXTENSION IF NOT EXISTS rum")
+            _create_partitioned_index("rum_chat_turns_search_tsv", "search_tsv rum_tsvector_ops", using="rum")
+        else:
+            _create_partitioned_index("gin_chat_turns_search_tsv", "search_tsv", using="gin")
+        if os.getenv("MARUNTIME_ENABLE_FUZZY_SEARCH") == "1":
+            # Trigram GIN is the costliest index on the write path and chat
+            # search scores similarity() without the indexable % operator, so
+            # it is opt-in. Enabling it later is a single CREATE INDEX
+            # CONCURRENTLY ... USING gin (search_text_norm gin_trgm_ops).
+            _create_partitioned_index("gin_chat_turns_search_trgm", "search_text_norm gin_trgm_ops", using="gin")
+
+
 def _create_generic() -> None:
     op.create_table(
         "chat_turns",
@@ -128,14 +191,18 @@ def upgrade() -> None:
     bind = op.get_bind()
     if bind.dialect.name == "postgresql":
         _create_postgres()
+        # Any bulk load of existing chat history belongs here, before indexing.
+        _create_postgres_indexes()
     else:
         _create_generic()
 
 
 def downgrade() -> None:
-    op.drop_index("ix_chat_turns_owner_chat_pos", table_name="chat_turns")
     bind = op.get_bind()
     if bind.dialect.name == "postgresql":
-        op.drop_index("gin_chat_turns_search_trgm", table_name="chat_turns")
-        op.drop_index("gin_chat_turns_search_tsv", table_name="chat_turns")
-    op.drop_table("chat_turns")
+        # Dropping the partitioned parent drops its partitions and indexes.
+        op.drop_table("chat_turns")
+        op.execute("DROP FUNCTION IF EXISTS chat_turns_search_update()")
+    else:
+        op.drop_index("ix_chat_turns_owner_chat_pos", table_name="chat_turns")
+        op.drop_table("chat_turns")
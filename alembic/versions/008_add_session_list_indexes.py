@@ -0,0 +1,44 @@
+"""Add composite indexes for the admin session listing.
+
+Revision ID: 008_add_session_list_indexes
+Revises: 007_add_tool_category
+Create Date: 2026-10-16
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "008_add_session_list_indexes"
+down_revision: Union[str, None] = "007_add_tool_category"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Each admin /sessions filter is an equality on one column followed by
+# ORDER BY created_at DESC; a (filter, created_at) btree serves both, read
+# backwards, so the listing stops after LIMIT rows without a sort.
+SESSION_LIST_INDEXES = {
+    "ix_sessions_template_version_created": ["template_version_id", "created_at"],
+    "ix_sessions_instance_created": ["instance_id", "created_at"],
+    "ix_sessions_state_created": ["state", "created_at"],
+}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        # CONCURRENTLY keeps sessions writable while the indexes build.
+        with op.get_context().autocommit_block():
+            for name, columns in SESSION_LIST_INDEXES.items():
+                op.create_index(name, "sessions", columns, postgresql_concurrently=True)
+    else:
+        for name, columns in SESSION_LIST_INDEXES.items():
+            op.create_index(name, "sessions", columns)
+
+
+def downgrade() -> None:
+    for name in SESSION_LIST_INDEXES:
+        op.drop_index(name, table_name="sessions")
@@ -0,0 +1,30 @@
+"""Make auth_sessions.token_hash unique.
+
+Revision ID: 009_unique_auth_session_token
+Revises: 008_add_session_list_indexes
+Create Date: 2026-10-16
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "009_unique_auth_session_token"
+down_revision: Union[str, None] = "008_add_session_list_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Every authenticated request looks a session up by its token hash; a
+    # unique index lets the planner stop at the first match. users.login is
+    # already unique since 20260108_000001.
+    op.drop_index("ix_auth_sessions_token_hash", table_name="auth_sessions")
+    op.create_index("ix_auth_sessions_token_hash", "auth_sessions", ["token_hash"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_auth_sessions_token_hash", table_name="auth_sessions")
+    op.create_index("ix_auth_sessions_token_hash", "auth_sessions", ["token_hash"])
@@ -0,0 +1,48 @@
+"""Store users.password_hash as bytes.
+
+Revision ID: 010_password_hash_bytes
+Revises: 009_unique_auth_session_token
+Create Date: 2026-10-16
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "010_password_hash_bytes"
+down_revision: Union[str, None] = "009_unique_auth_session_token"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.alter_column(
+            "users",
+            "password_hash",
+            type_=sa.LargeBinary(),
+            existing_nullable=False,
+            postgresql_using="convert_to(password_hash, 'UTF8')",
+        )
+    else:
+        # SQLite keeps whatever storage class a value was written with, so
+        # converting the stored hashes is enough.
+        op.execute("UPDATE users SET password_hash = CAST(password_hash AS BLOB)")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.alter_column(
+            "users",
+            "password_hash",
+            type_=sa.String(255),
+            existing_nullable=False,
+            postgresql_using="convert_from(password_hash, 'UTF8')",
+        )
+    else:
+        op.execute("UPDATE users SET password_hash = CAST(password_hash AS TEXT)")
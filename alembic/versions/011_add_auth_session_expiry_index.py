@@ -0,0 +1,36 @@
+"""Index auth_sessions.expires_at for expired-session cleanup.
+
+Revision ID: 011_add_auth_session_expiry_index
+Revises: 010_password_hash_bytes
+Create Date: 2026-10-16
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "011_add_auth_session_expiry_index"
+down_revision: Union[str, None] = "010_password_hash_bytes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The periodic cleanup selects expires_at < now() in LIMIT-sized batches;
+    # a btree lets each batch read only expired rows. A partial index cannot
+    # help here: now() is not immutable, so it is not allowed in the predicate.
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        # CONCURRENTLY keeps logins writing sessions while the index builds.
+        with op.get_context().autocommit_block():
+            op.create_index(
+                "ix_auth_sessions_expires_at", "auth_sessions", ["expires_at"], postgresql_concurrently=True
+            )
+    else:
+        op.create_index("ix_auth_sessions_expires_at", "auth_sessions", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_auth_sessions_expires_at", table_name="auth_sessions")
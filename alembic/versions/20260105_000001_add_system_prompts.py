@@ -7,6 +7,7 @@ Create Date: 2026-01-05 00:00:01.000000
 
 from __future__ import annotations
 
+import json
 from typing import Sequence, Union
 
 from alembic import op
@@ -90,9 +91,33 @@ Please continue with your task using this additional information.
 ]
 
 
+def _bulk_seed(bind: sa.engine.Connection, table: sa.Table, rows: list[dict]) -> None:
+    """Load seed rows with COPY on psycopg, or a single executemany elsewhere."""
+    json_columns = {column.name for column in table.columns if isinstance(column.type, sa.JSON)}
+    if op.get_context().as_sql:
+        # Offline scripts get one multi-row INSERT ... VALUES (...), (...).
+        # JSON has no literal renderer, so those values are inlined as text.
+        literal_rows = [
+            {c: sa.literal(json.dumps(v), sa.Text()) if c in json_columns else v for c, v in row.items()}
+            for row in rows
+        ]
+        op.execute(table.insert().values(literal_rows))
+        return
+    if bind.dialect.name == "postgresql" and bind.dialect.driver == "psycopg":
+        columns = [column.name for column in table.columns]
+        with bind.connection.driver_connection.cursor() as cursor:
+            with cursor.copy(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN") as copy:
+                for row in rows:
+                    copy.write_row(
+                        tuple(json.dumps(row[c]) if c in json_columns else row[c] for c in columns)
+                    )
+        return
+    bind.execute(table.insert(), rows)
+
+
 def upgrade() -> None:
-    # Create system_prompts table
-    op.create_table(
+    # Create system_prompts table; the returned Table is reused for the seed
+    system_prompts = op.create_table(
         "system_prompts",
         sa.Column("id", sa.String(length=50), nullable=False),
         sa.Column("name", sa.String(length=255), nullable=False),
@@ -107,36 +132,24 @@ def upgrade() -> None:
 
     # Seed default prompts
     bind = op.get_bind()
-    meta = sa.MetaData()
-    system_prompts = sa.Table(
-        "system_prompts",
-        meta,
-        sa.Column("id", sa.String(50)),
-        sa.Column("name", sa.String(255)),
-        sa.Column("description", sa.Text),
-        sa.Column("content", sa.Text),
-        sa.Column("placeholders", sa.JSON),
-        sa.Column("is_active", sa.Boolean),
-        sa.Column("created_at", sa.DateTime(timezone=True)),
-        sa.Column("updated_at", sa.DateTime(timezone=True)),
-    )
 
     from datetime import datetime
     now = datetime.utcnow()
 
-    for prompt in DEFAULT_PROMPTS:
-        bind.execute(
-            system_prompts.insert().values(
-                id=prompt["id"],
-                name=prompt["name"],
-                description=prompt["description"],
-                content=prompt["content"],
-                placeholders=prompt["placeholders"],
-                is_active=True,
-                created_at=now,
-                updated_at=now,
-            )
-        )
+    rows = [
+        {
+            "id": prompt["id"],
+            "name": prompt["name"],
+            "description": prompt["description"],
+            "content": prompt["content"],
+            "placeholders": prompt["placeholders"],
+            "is_active": True,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for prompt in DEFAULT_PROMPTS
+    ]
+    _bulk_seed(bind, system_prompts, rows)
 
 
 def downgrade() -> None:
@@ -11,6 +11,7 @@ from typing import Sequence, Union
 
 from alembic import op
 import sqlalchemy as sa
+from sqlalchemy.schema import CreateColumn
 
 
 # revision identifiers, used by Alembic.
@@ -20,6 +21,50 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
+def _new_instance_columns() -> list[sa.Column]:
+    return [
+        # Identity columns
+        sa.Column("name", sa.String(100), nullable=True),
+        sa.Column("display_name", sa.String(255), nullable=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        # Configuration columns. Default and NOT NULL go in the same ADD COLUMN
+        # so PostgreSQL 11+ records a fast default instead of rewriting the table.
+        sa.Column("is_enabled", sa.Boolean(), nullable=False, server_default="true"),
+        sa.Column("auto_start", sa.Boolean(), nullable=False, server_default="false"),
+        sa.Column("priority", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("config_overrides", sa.JSON(), nullable=True),
+        # Statistics columns
+        sa.Column("total_sessions", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total_messages", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total_tool_calls", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("last_error_at", sa.DateTime(timezone=True), nullable=True),
+        # Lifecycle columns
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("stopped_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    ]
+
+
+_NAME_BACKFILL_SET = "name = 'instance-' || SUBSTRING(id, 1, 8), status = 'OFFLINE'"
+
+# A failed CONCURRENTLY build leaves an INVALID index behind, which IF NOT
+# EXISTS would then happily reuse and ADD CONSTRAINT ... USING INDEX reject.
+_DROP_INVALID_NAME_INDEX = """
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_index
+        WHERE indexrelid = to_regclass('uq_agent_instances_name') AND NOT indisvalid
+    ) THEN
+        DROP INDEX uq_agent_instances_name;
+    END IF;
+END
+$$
+"""
+
+
 def upgrade() -> None:
     # Add instance_id to sessions table
     op.add_column(
@@ -34,19 +79,11 @@ def upgrade() -> None:
         nullable=True
     )
 
-    # Extend agent_instances table with new columns
-    # Identity columns
-    op.add_column(
-        "agent_instances",
-        sa.Column("name", sa.String(100), nullable=True)
-    )
-    op.add_column(
-        "agent_instances",
-        sa.Column("display_name", sa.String(255), nullable=True)
-    )
-    op.add_column(
+    # Default new instances to OFFLINE at the database level
+    op.alter_column(
         "agent_instances",
-        sa.Column("description", sa.Text(), nullable=True)
+        "status",
+        server_default="OFFLINE"
     )
 
     # Rename session_id to current_session_id
@@ -56,83 +93,42 @@ def upgrade() -> None:
         new_column_name="current_session_id"
     )
 
-    # Configuration columns
-    op.add_column(
-        "agent_instances",
-        sa.Column("is_enabled", sa.Boolean(), nullable=True, server_default="true")
-    )
-    op.add_column(
-        "agent_instances",
-        sa.Column("auto_start", sa.Boolean(), nullable=True, server_default="false")
-    )
-    op.add_column(
-        "agent_instances",
-        sa.Column("priority", sa.Integer(), nullable=True, server_default="0")
-    )
-    op.add_column(
-        "agent_instances",
-        sa.Column("config_overrides", sa.JSON(), nullable=True)
-    )
-
-    # Statistics columns
-    op.add_column(
-        "agent_instances",
-        sa.Column("total_sessions", sa.Integer(), nullable=True, server_default="0")
-    )
-    op.add_column(
-        "agent_instances",
-        sa.Column("total_messages", sa.Integer(), nullable=True, server_default="0")
-    )
-    op.add_column(
-        "agent_instances",
-        sa.Column("total_tool_calls", sa.Integer(), nullable=True, server_default="0")
-    )
-    op.add_column(
-        "agent_instances",
-        sa.Column("error_count", sa.Integer(), nullable=True, server_default="0")
-    )
-    op.add_column(
-        "agent_instances",
-        sa.Column("last_error", sa.Text(), nullable=True)
-    )
-    op.add_column(
-        "agent_instances",
-        sa.Column("last_error_at", sa.DateTime(timezone=True), nullable=True)
-    )
-
-    # Lifecycle columns
-    op.add_column(
-        "agent_instances",
-        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True)
-    )
-    op.add_column(
-        "agent_instances",
-        sa.Column("stopped_at", sa.DateTime(timezone=True), nullable=True)
-    )
-    op.add_column(
-        "agent_instances",
-        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True)
-    )
-
-    # Update existing rows: generate name from id, set status to OFFLINE
+    # Extend agent_instances table with new columns. PostgreSQL gets a single
+    # ALTER TABLE with every ADD COLUMN clause, so the exclusive lock is taken
+    # once; SQLite cannot add several columns per statement.
     bind = op.get_bind()
-    bind.execute(sa.text("""
-        UPDATE agent_instances 
-        SET name = 'instance-' || SUBSTRING(id, 1, 8),
-            status = 'OFFLINE',
-            is_enabled = true,
-            auto_start = false,
-            priority = 0,
-            total_sessions = 0,
-            total_messages = 0,
-            total_tool_calls = 0,
-            error_count = 0
-        WHERE name IS NULL
-    """))
+    columns = _new_instance_columns()
+    if bind.dialect.name == "postgresql":
+        clauses = ", ".join(
+            f"ADD COLUMN {CreateColumn(column).compile(dialect=bind.dialect)}" for column in columns
+        )
+        op.execute(f"ALTER TABLE agent_instances {clauses}")
+    else:
+        for column in columns:
+            op.add_column("agent_instances", column)
+
+    # Update existing rows: generate name from id, set status to OFFLINE.
+    # Flags and counters are already filled by their server defaults above,
+    # so only the columns without a usable default are written here.
+    op.execute(f"UPDATE agent_instances SET {_NAME_BACKFILL_SET} WHERE name IS NULL")
 
     # Now make name NOT NULL and add unique constraint
     op.alter_column("agent_instances", "name", nullable=False)
-    op.create_unique_constraint("uq_agent_instances_name", "agent_instances", ["name"])
+    if bind.dialect.name == "postgresql":
+        # Build the unique index without blocking writers, then promote it to
+        # the constraint so no second index build is needed.
+        with op.get_context().autocommit_block():
+            op.execute(_DROP_INVALID_NAME_INDEX)
+            op.execute(
+                "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_agent_instances_name "
+                "ON agent_instances (name)"
+            )
+        op.execute(
+            "ALTER TABLE agent_instances "
+            "ADD CONSTRAINT uq_agent_instances_name UNIQUE USING INDEX uq_agent_instances_name"
+        )
+    else:
+        op.create_unique_constraint("uq_agent_instances_name", "agent_instances", ["name"])
 
     # Add foreign key for sessions.instance_id
     op.create_foreign_key(
@@ -154,6 +150,8 @@ def downgrade() -> None:
     # Remove unique constraint
     op.drop_constraint("uq_agent_instances_name", "agent_instances", type_="unique")
 
+    op.alter_column("agent_instances", "status", server_default=None)
+
     # Remove new columns from agent_instances
     op.drop_column("agent_instances", "updated_at")
     op.drop_column("agent_instances", "stopped_at")
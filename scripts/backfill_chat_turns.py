@@ -22,6 +22,7 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import io
 import os
 import re
 import sys
@@ -31,78 +32,87 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from sqlalchemy import select, text
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy import exists, make_url, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from maruntime.persistence.models import ChatTurn, Session, User
 
 
-# Message header pattern (matches new format with [role])
-MESSAGE_HEADER_RE = re.compile(
+# Message header pattern; the optional [role] also covers the legacy format
+HEADER_RE = re.compile(
     r"^###\s+(?:\[(?P<role>[^\]]+)\]\s+)?(?P<actor>.+?)\s*\((?P<timestamp>[^)]+)\)\s*$"
 )
 
-# Legacy header pattern (without [role])
-LEGACY_HEADER_RE = re.compile(
-    r"^###\s+(?P<actor>.+?)\s*\((?P<timestamp>[^)]+)\)\s*$"
-)
+
+_ASSISTANT_ROLES = frozenset({"assistant", "agent", "ai", "model", "bot"})
+_USER_ROLES = frozenset({"user"})
+
+
+# Below this many rows per user the ORM insert is cheaper than setting up COPY
+COPY_THRESHOLD = 100
+
+CHAT_TURN_COLUMNS = ("user_id", "chat_id", "turn_index", "user_text", "assistant_text")
+
+# Users backfilled at once; each holds one pooled connection while it runs
+MAX_CONCURRENT_USERS = 8
+
+PREPARED_STATEMENT_CACHE_SIZE = 1024
 
 
 def parse_chat_file(file_path: Path) -> list[dict]:
     """Parse a chat markdown file into messages."""
-    content = file_path.read_text(encoding="utf-8")
     messages = []
     current = None
-    buffer = []
+    buffer = io.StringIO()
     
-    for line in content.splitlines():
-        # Try new format first
-        header_match = MESSAGE_HEADER_RE.match(line)
-        if not header_match:
-            # Try legacy format
-            header_match = LEGACY_HEADER_RE.match(line)
-        
-        if header_match:
-            # Save previous message
-            if current is not None:
-                current["content"] = "\n".join(buffer).strip()
-                messages.append(current)
-                buffer = []
-            
-            # Parse role from header
-            role = header_match.groupdict().get("role", "").strip().lower() if "role" in header_match.groupdict() else None
-            actor = header_match.group("actor").strip()
-            timestamp = header_match.group("timestamp").strip()
+    # Iterate the file lazily rather than holding it and a list of its lines
+    with file_path.open("r", encoding="utf-8") as chat_file:
+        for line in chat_file:
+            line = line.rstrip("\n")
+            # Most lines are message body; only enter the regex for header candidates
+            header_match = HEADER_RE.match(line) if line.startswith("###") else None
+            if header_match:
+                # Save previous message
+                if current is not None:
+                    current["content"] = buffer.getvalue().strip()
+                    messages.append(current)
+                    buffer = io.StringIO()
+                
+                # Parse role from header
+                role = (header_match.group("role") or "").strip().lower()
+                actor = header_match.group("actor").strip()
+                timestamp = header_match.group("timestamp").strip()
+                
+                # Infer role from actor name if not explicit
+                if not role:
+                    actor_lower = actor.lower()
+                    if "agent" in actor_lower or "assistant" in actor_lower:
+                        role = "assistant"
+                    else:
+                        role = "user"
+                
+                current = {
+                    "role": role,
+                    "actor": actor,
+                    "timestamp": timestamp,
+                }
+                continue
             
-            # Infer role from actor name if not explicit
-            if not role:
-                actor_lower = actor.lower()
-                if "agent" in actor_lower or "assistant" in actor_lower:
-                    role = "assistant"
-                else:
-                    role = "user"
+            if line.strip() == "---":
+                if current is not None:
+                    current["content"] = buffer.getvalue().strip()
+                    messages.append(current)
+                    current = None
+                    buffer = io.StringIO()
+                continue
             
-            current = {
-                "role": role,
-                "actor": actor,
-                "timestamp": timestamp,
-            }
-            continue
-        
-        if line.strip() == "---":
             if current is not None:
-                current["content"] = "\n".join(buffer).strip()
-                messages.append(current)
-                current = None
-                buffer = []
-            continue
-        
-        if current is not None:
-            buffer.append(line)
+                buffer.write(line)
+                buffer.write("\n")
     
     # Don't forget last message
     if current is not None:
-        current["content"] = "\n".join(buffer).strip()
+        current["content"] = buffer.getvalue().strip()
         messages.append(current)
     
     return messages
@@ -114,17 +124,14 @@ def build_turns(messages: list[dict]) -> list[dict]:
     current_turn = {"user": None, "assistant": None}
     
     for msg in messages:
-        role = msg.get("role", "").lower()
+        role = (msg.get("role") or "").lower()
         
         # Normalize role names
-        if role in {"agent", "ai", "model", "bot"}:
+        if role in _ASSISTANT_ROLES:
             role = "assistant"
-        elif role not in {"user", "assistant"}:
+        elif role not in _USER_ROLES:
             # Guess from context
-            if current_turn["user"] is None:
-                role = "user"
-            else:
-                role = "assistant"
+            role = "user" if current_turn["user"] is None else "assistant"
         
         if role == "user":
             # Start new turn if we already have a user message
@@ -150,6 +157,35 @@ def build_turns(messages: list[dict]) -> list[dict]:
     return turns
 
 
+def _list_chat_files(user_dir: Path) -> list[Path] | None:
+    """Return the user's chat files in name order, or None if the directory is missing."""
+    if not user_dir.exists():
+        return None
+    return sorted(user_dir.glob("*.md"))
+
+
+async def insert_turns(session: AsyncSession, rows: list[tuple]) -> None:
+    """Insert (user_id, chat_id, turn_index, user_text, assistant_text) rows.
+    
+    Large batches on asyncpg are streamed with COPY; everything else goes
+    through the ORM.
+    """
+    if not rows:
+        return
+    
+    connection = await session.connection()
+    if len(rows) >= COPY_THRESHOLD and connection.dialect.driver == "asyncpg":
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            ChatTurn.__tablename__,
+            records=rows,
+            columns=list(CHAT_TURN_COLUMNS),
+        )
+        return
+    
+    session.add_all(ChatTurn(**dict(zip(CHAT_TURN_COLUMNS, row))) for row in rows)
+
+
 async def backfill_user_chats(
     session_factory: async_sessionmaker,
     user_id: str,
@@ -165,39 +201,58 @@ async def backfill_user_chats(
     }
     
     user_dir = chats_dir / user_id
-    if not user_dir.exists():
+    # Directory listing can stall on network mounts, so keep it off the loop
+    chat_files = await asyncio.to_thread(_list_chat_files, user_dir)
+    if chat_files is None:
         stats["errors"].append(f"User directory not found: {user_dir}")
         return stats
     
+    # Parse every chat file in worker threads while the DB lookups below run
+    parsing = asyncio.gather(
+        *(asyncio.to_thread(parse_chat_file, chat_file) for chat_file in chat_files),
+        return_exceptions=True,
+    )
+    
     async with session_factory() as session:
         # Verify user exists in DB
-        user_result = await session.execute(
-            select(User).where(User.id == user_id)
-        )
-        user = user_result.scalars().first()
-        if not user:
+        user_exists = await session.scalar(select(exists().where(User.id == user_id)))
+        if not user_exists:
             stats["errors"].append(f"User not found in DB: {user_id}")
             return stats
         
-        for chat_file in user_dir.glob("*.md"):
+        # Verify the chat sessions exist in DB with one query for all files.
+        # Matched by id rather than owner: sessions.user_id is nullable.
+        session_result = await session.execute(
+            select(Session.id).where(Session.id.in_([chat_file.stem for chat_file in chat_files]))
+        )
+        known_session_ids = set(session_result.scalars().all())
+        
+        pending: list[tuple] = []
+        
+        for chat_file, messages in zip(chat_files, await parsing):
             session_id = chat_file.stem
             
-            # Verify session exists in DB
-            session_result = await session.execute(
-                select(Session).where(Session.id == session_id)
-            )
-            db_session = session_result.scalars().first()
-            if not db_session:
+            if session_id not in known_session_ids:
                 print(f"  ⚠️  Session not in DB, skipping: {session_id}")
                 stats["turns_skipped"] += 1
                 continue
             
             try:
-                messages = parse_chat_file(chat_file)
+                if isinstance(messages, Exception):
+                    raise messages
                 turns = build_turns(messages)
                 
                 print(f"  📄 {chat_file.name}: {len(messages)} messages → {len(turns)} turns")
                 
+                # Load already-indexed turns once per file instead of probing per turn
+                existing_result = await session.execute(
+                    select(ChatTurn.turn_index).where(
+                        ChatTurn.user_id == user_id,
+                        ChatTurn.chat_id == session_id,
+                    )
+                )
+                existing_indices = set(existing_result.scalars().all())
+                
                 for idx, turn in enumerate(turns):
                     user_msg = turn.get("user") or {}
                     assistant_msg = turn.get("assistant") or {}
@@ -208,27 +263,14 @@ async def backfill_user_chats(
                     if not user_text and not assistant_text:
                         continue
                     
-                    # Check if turn already exists
-                    existing = await session.execute(
-                        select(ChatTurn).where(
-                            ChatTurn.user_id == user_id,
-                            ChatTurn.chat_id == session_id,
-                            ChatTurn.turn_index == idx,
-                        )
-                    )
-                    if existing.scalars().first():
+                    if idx in existing_indices:
                         stats["turns_skipped"] += 1
                         continue
                     
                     if not dry_run:
-                        chat_turn = ChatTurn(
-                            user_id=user_id,
-                            chat_id=session_id,
-                            turn_index=idx,
-                            user_text=user_text,
-                            assistant_text=assistant_text if assistant_text else None,
+                        pending.append(
+                            (user_id, session_id, idx, user_text, assistant_text if assistant_text else None)
                         )
-                        session.add(chat_turn)
                     
                     stats["turns_created"] += 1
                 
@@ -238,6 +280,12 @@ async def backfill_user_chats(
                 stats["errors"].append(f"{chat_file.name}: {e}")
         
         if not dry_run:
+            connection = await session.connection()
+            if connection.dialect.name == "postgresql":
+                # A lost commit is just re-imported on the next run, so skip
+                # waiting for the WAL flush for this transaction only.
+                await session.execute(text("SET LOCAL synchronous_commit = OFF"))
+            await insert_turns(session, pending)
             await session.commit()
     
     return stats
@@ -282,7 +330,18 @@ async def main():
         print("🔍 DRY RUN - no changes will be made")
     print()
     
-    engine = create_async_engine(args.database_url)
+    database_url = make_url(args.database_url)
+    engine_kwargs = {}
+    if database_url.get_backend_name() != "sqlite":
+        # Enough connections for every concurrent user, never more
+        engine_kwargs = {"pool_size": MAX_CONCURRENT_USERS, "max_overflow": 0}
+    if database_url.get_driver_name() == "asyncpg":
+        # The same handful of statements run for every chat file; keep them
+        # all prepared on each pooled connection (the dialect default is 100).
+        database_url = database_url.update_query_dict(
+            {"prepared_statement_cache_size": str(PREPARED_STATEMENT_CACHE_SIZE), **database_url.query}
+        )
+    engine = create_async_engine(database_url, **engine_kwargs)
     session_factory = async_sessionmaker(engine, expire_on_commit=False)
     
     # Find user directories
@@ -291,29 +350,28 @@ async def main():
     else:
         user_ids = [d.name for d in chats_dir.iterdir() if d.is_dir()]
     
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_USERS)
+    
+    async def run_user(user_id: str) -> dict:
+        async with semaphore:
+            print(f"👤 Processing user: {user_id}")
+            return await backfill_user_chats(
+                session_factory,
+                user_id,
+                chats_dir,
+                dry_run=args.dry_run,
+            )
+    
+    results = await asyncio.gather(*(run_user(user_id) for user_id in user_ids))
+    
     total_stats = {
-        "users_processed": 0,
-        "files_processed": 0,
-        "turns_created": 0,
-        "turns_skipped": 0,
-        "errors": [],
+        "users_processed": len(results),
+        "files_processed": sum(stats["files_processed"] for stats in results),
+        "turns_created": sum(stats["turns_created"] for stats in results),
+        "turns_skipped": sum(stats["turns_skipped"] for stats in results),
+        "errors": [error for stats in results for error in stats["errors"]],
     }
-    
-    for user_id in user_ids:
-        print(f"👤 Processing user: {user_id}")
-        stats = await backfill_user_chats(
-            session_factory,
-            user_id,
-            chats_dir,
-            dry_run=args.dry_run,
-        )
-        
-        total_stats["users_processed"] += 1
-        total_stats["files_processed"] += stats["files_processed"]
-        total_stats["turns_created"] += stats["turns_created"]
-        total_stats["turns_skipped"] += stats["turns_skipped"]
-        total_stats["errors"].extend(stats["errors"])
-        print()
+    print()
     
     await engine.dispose()
     
@@ -340,4 +398,9 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
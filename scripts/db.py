@@ -8,6 +8,7 @@ from typing import Optional
 
 from alembic import command
 from alembic.config import Config
+from sqlalchemy.engine import Connection
 
 from maruntime.persistence import Base, create_engine
 
@@ -33,18 +34,21 @@ def _to_sync_url(url: str) -> str:
     return url
 
 
+def _run_on_connection(connection: Connection, cfg: Config, alembic_command, revision: str) -> None:
+    cfg.attributes["connection"] = connection
+    alembic_command(cfg, revision)
+
+
 async def init_database(url: str, *, stamp: bool = True, config_path: Optional[str] = None) -> None:
     engine = create_engine(url)
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        if stamp:
+            # Stamp on the same connection instead of opening a sync engine
+            cfg = _alembic_config(_to_sync_url(url), config_path)
+            await conn.run_sync(_run_on_connection, cfg, command.stamp, "head")
     await engine.dispose()
 
-    if stamp:
-        # Use sync URL for Alembic stamp (runs outside async context)
-        sync_url = _to_sync_url(url)
-        cfg = _alembic_config(sync_url, config_path)
-        command.stamp(cfg, "head")
-
 
 def upgrade_database(url: str, revision: str = "head", *, config_path: Optional[str] = None) -> None:
     sync_url = _to_sync_url(url)
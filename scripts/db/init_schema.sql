@@ -31,7 +31,7 @@ DROP TABLE IF EXISTS alembic_version CASCADE;
 CREATE TABLE users (
     id VARCHAR(36) PRIMARY KEY,
     login VARCHAR(50) NOT NULL UNIQUE,
-    password_hash VARCHAR(255) NOT NULL,
+    password_hash BYTEA NOT NULL,
     display_name VARCHAR(100) NOT NULL,
     about TEXT,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
@@ -134,20 +134,20 @@ CREATE TABLE agent_instances (
     description TEXT,
 
     -- Status
-    status VARCHAR(50),
+    status VARCHAR(50) DEFAULT 'OFFLINE',
     last_heartbeat TIMESTAMP WITH TIME ZONE,
 
     -- Configuration
-    is_enabled BOOLEAN DEFAULT true,
-    auto_start BOOLEAN DEFAULT false,
-    priority INTEGER DEFAULT 0,
+    is_enabled BOOLEAN DEFAULT true NOT NULL,
+    auto_start BOOLEAN DEFAULT false NOT NULL,
+    priority INTEGER DEFAULT 0 NOT NULL,
     config_overrides JSON,
 
     -- Statistics
-    total_sessions INTEGER DEFAULT 0,
-    total_messages INTEGER DEFAULT 0,
-    total_tool_calls INTEGER DEFAULT 0,
-    error_count INTEGER DEFAULT 0,
+    total_sessions INTEGER DEFAULT 0 NOT NULL,
+    total_messages INTEGER DEFAULT 0 NOT NULL,
+    total_tool_calls INTEGER DEFAULT 0 NOT NULL,
+    error_count INTEGER DEFAULT 0 NOT NULL,
     last_error TEXT,
     last_error_at TIMESTAMP WITH TIME ZONE,
 
@@ -182,8 +182,9 @@ CREATE TABLE session_messages (
 );
 
 -- Chat Turns (indexed Q/A pairs for search)
+-- Hash-partitioned by owner so per-user searches stay within one partition
 CREATE TABLE chat_turns (
-    id BIGSERIAL PRIMARY KEY,
+    id BIGSERIAL,
     user_id VARCHAR(36) NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     chat_id VARCHAR(36) NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
     turn_index INTEGER NOT NULL,
@@ -191,21 +192,48 @@ CREATE TABLE chat_turns (
     assistant_text TEXT,
     created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
 
-    search_text TEXT GENERATED ALWAYS AS (
-        coalesce(user_text, '') || E'\n\n' || coalesce(assistant_text, '')
-    ) STORED,
-    search_text_norm TEXT GENERATED ALWAYS AS (
-        lower(regexp_replace(
-            coalesce(user_text, '') || E'\n\n' || coalesce(assistant_text, ''),
-            '[^[:alnum:][:space:]]+', ' ', 'g'
-        ))
-    ) STORED,
-    search_tsv TSVECTOR GENERATED ALWAYS AS (
-        to_tsvector('russian', coalesce(user_text, '') || E'\n\n' || coalesce(assistant_text, ''))
-    ) STORED,
+    search_text TEXT,
+    search_text_norm TEXT,
+    search_tsv TSVECTOR,
 
+    CONSTRAINT chat_turns_pkey PRIMARY KEY (id, user_id),
     CONSTRAINT uq_chat_turns_order UNIQUE (user_id, chat_id, turn_index)
-);
+) PARTITION BY HASH (user_id);
+
+DO $$
+BEGIN
+    FOR i IN 0..15 LOOP
+        EXECUTE format(
+            'CREATE TABLE chat_turns_p%s PARTITION OF chat_turns FOR VALUES WITH (MODULUS 16, REMAINDER %s)',
+            i, i
+        );
+    END LOOP;
+END
+$$;
+
+-- Search columns are trigger-maintained and only recomputed when texts change
+CREATE OR REPLACE FUNCTION chat_turns_search_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE'
+       AND NEW.user_text IS NOT DISTINCT FROM OLD.user_text
+       AND NEW.assistant_text IS NOT DISTINCT FROM OLD.assistant_text THEN
+        RETURN NEW;
+    END IF;
+    NEW.search_text := coalesce(NEW.user_text, '') || E'\n\n' || coalesce(NEW.assistant_text, '');
+    -- translate() is a per-character table lookup; unlike the old regex it
+    -- leaves runs of spaces, which trigram similarity ignores anyway.
+    NEW.search_text_norm := lower(translate(NEW.search_text, '!"#$%&''()*+,-./:;<=>?@[\]^_`{|}~«»„“”‘’‚‹›—–‒…•·№§°±×÷¶©®™€£¥¢¡¿‰†‡′″', '                                                                     '));
+    -- One weighted vector: user text ranks above assistant text (A over B).
+    -- ChatMemoryService passes explicit ts_rank_cd weights for these labels.
+    NEW.search_tsv := setweight(to_tsvector('russian', coalesce(NEW.user_text, '')), 'A')
+        || setweight(to_tsvector('russian', coalesce(NEW.assistant_text, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_chat_turns_search
+BEFORE INSERT OR UPDATE OF user_text, assistant_text ON chat_turns
+FOR EACH ROW EXECUTE FUNCTION chat_turns_search_update();
 
 -- Sources (data sources for sessions)
 CREATE TABLE sources (
@@ -247,17 +275,22 @@ CREATE TABLE alembic_version (
     version_num VARCHAR(32) PRIMARY KEY
 );
 
-INSERT INTO alembic_version (version_num) VALUES ('007_add_tool_category');
+INSERT INTO alembic_version (version_num) VALUES ('011_add_auth_session_expiry_index');
 
 -- =============================================================================
 -- Indexes for Performance
 -- =============================================================================
 
-CREATE INDEX ix_auth_sessions_token_hash ON auth_sessions(token_hash);
+CREATE UNIQUE INDEX ix_auth_sessions_token_hash ON auth_sessions(token_hash);
 CREATE INDEX idx_auth_sessions_user ON auth_sessions(user_id);
+CREATE INDEX ix_auth_sessions_expires_at ON auth_sessions(expires_at);
 
 CREATE INDEX idx_sessions_user ON sessions(user_id);
-CREATE INDEX ix_session_messages_message_type ON session_messages(message_type);
+CREATE INDEX ix_sessions_template_version_created ON sessions(template_version_id, created_at);
+CREATE INDEX ix_sessions_instance_created ON sessions(instance_id, created_at);
+CREATE INDEX ix_sessions_state_created ON sessions(state, created_at);
+CREATE INDEX ix_session_messages_step ON session_messages(session_id, step_number)
+  INCLUDE (message_type) WHERE message_type <> 'message';
 
 CREATE INDEX ix_chat_turns_user_id
   ON chat_turns (user_id);
@@ -268,11 +301,15 @@ CREATE INDEX ix_chat_turns_chat_id
 CREATE INDEX ix_chat_turns_owner_chat_pos
   ON chat_turns (user_id, chat_id, turn_index);
 
+CREATE INDEX brin_chat_turns_created
+  ON chat_turns USING BRIN (created_at) WITH (pages_per_range = 32);
+
 CREATE INDEX gin_chat_turns_search_tsv
   ON chat_turns USING GIN (search_tsv);
 
-CREATE INDEX gin_chat_turns_search_trgm
-  ON chat_turns USING GIN (search_text_norm gin_trgm_ops);
+-- Optional fuzzy-search index (MARUNTIME_ENABLE_FUZZY_SEARCH=1 in migrations):
+-- CREATE INDEX gin_chat_turns_search_trgm
+--   ON chat_turns USING GIN (search_text_norm gin_trgm_ops);
 
 -- =============================================================================
 -- Done
@@ -3,22 +3,34 @@ from __future__ import annotations
 import argparse
 import asyncio
 import ast
+import functools
 import os
 import subprocess
 import tempfile
 from dataclasses import dataclass, field
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Iterable, Optional
+from typing import Any, Iterable, Iterator, Optional
 
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from maruntime.persistence import AgentTemplate, TemplateVersion, Tool, create_engine, create_session_factory
-from maruntime.persistence.repositories import ToolRepository
+from maruntime.persistence.repositories import TemplateRepository, ToolRepository
 from maruntime.runtime.templates import ExecutionPolicy, LLMPolicy, PromptConfig, TemplateService, ToolPolicy
 
 DEFAULT_MODEL = os.getenv("DEFAULT_LLM_MODEL", "gpt-4o-mini")
 DEFAULT_REPO_URL = "https://github.com/sourcegraph/sgr-agent-core.git"
 
+# Repository directories that definitions are read from
+_TOOLS_DIR = "sgr_deep_research/core/tools"
+_AGENT_DIRS = ("sgr_deep_research/core/agents", "sgr_deep_research/agents")
+_DEFINITION_DIRS = (_TOOLS_DIR, *_AGENT_DIRS)
+
+# Dialects whose insert() supports ON CONFLICT DO UPDATE
+_UPSERT_INSERTS = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+
 
 @dataclass
 class ToolDefinition:
@@ -43,10 +55,31 @@ class AgentDefinition:
     activate: bool = True
 
 
-def _extract_literal_assignment(file_path: Path, candidate_names: Iterable[str]) -> Optional[dict[str, Any]]:
+_SKIPPED_DIRS = {".git", "__pycache__"}
+
+
+def _iter_py_files(root: Path) -> Iterator[Path]:
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [name for name in dirnames if name not in _SKIPPED_DIRS]
+        for filename in filenames:
+            if filename.endswith(".py") and filename != "__init__.py":
+                yield Path(dirpath, filename)
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_module(source: str) -> ast.Module:
+    # Keyed on file content, so files unchanged between branches parse once.
+    return ast.parse(source)
+
+
+def _extract_literal_assignment(source: str, candidate_names: Iterable[str]) -> Optional[dict[str, Any]]:
+    candidate_names = tuple(candidate_names)
+    # Most modules never mention a definition name; skip parsing those.
+    if not any(name in source for name in candidate_names):
+        return None
     try:
-        module = ast.parse(file_path.read_text())
-    except (SyntaxError, UnicodeDecodeError):
+        module = _parse_module(source)
+    except SyntaxError:
         return None
 
     for node in module.body:
@@ -63,15 +96,17 @@ def _extract_literal_assignment(file_path: Path, candidate_names: Iterable[str])
 
 
 def _parse_tool_definitions(repo_root: Path) -> list[ToolDefinition]:
-    tools_dir = repo_root / "sgr_deep_research" / "core" / "tools"
+    tools_dir = repo_root / _TOOLS_DIR
     if not tools_dir.exists():
         return []
 
     definitions: list[ToolDefinition] = []
-    for file_path in tools_dir.rglob("*.py"):
-        if file_path.name == "__init__.py":
+    for file_path in _iter_py_files(tools_dir):
+        try:
+            source = file_path.read_text()
+        except UnicodeDecodeError:
             continue
-        definition = _extract_literal_assignment(file_path, ["TOOL_DEFINITION", "TOOL", "DEFINITION"])
+        definition = _extract_literal_assignment(source, ["TOOL_DEFINITION", "TOOL", "DEFINITION"])
         if not definition:
             continue
         name = definition.get("name") or file_path.stem
@@ -96,18 +131,17 @@ def _parse_tool_definitions(repo_root: Path) -> list[ToolDefinition]:
 
 
 def _parse_agent_definitions(repo_root: Path) -> list[AgentDefinition]:
-    agent_dirs = [
-        repo_root / "sgr_deep_research" / "core" / "agents",
-        repo_root / "sgr_deep_research" / "agents",
-    ]
+    agent_dirs = [repo_root / agent_dir for agent_dir in _AGENT_DIRS]
     definitions: list[AgentDefinition] = []
     for agent_dir in agent_dirs:
         if not agent_dir.exists():
             continue
-        for file_path in agent_dir.rglob("*.py"):
-            if file_path.name == "__init__.py":
+        for file_path in _iter_py_files(agent_dir):
+            try:
+                source = file_path.read_text()
+            except UnicodeDecodeError:
                 continue
-            definition = _extract_literal_assignment(file_path, ["AGENT_DEFINITION", "AGENT_TEMPLATE", "AGENT"])
+            definition = _extract_literal_assignment(source, ["AGENT_DEFINITION", "AGENT_TEMPLATE", "AGENT"])
             if not definition:
                 continue
             name = definition.get("name") or file_path.stem
@@ -144,11 +178,19 @@ def _clone_repo(branch: str, target_dir: Path, *, repo_url: str) -> Path:
     if repo_path.exists():
         return repo_path
 
-    subprocess.run(
-        ["git", "clone", "--branch", branch, "--depth", "1", repo_url, str(repo_path)],
-        check=True,
-        capture_output=True,
-    )
+    # Partial, sparse clone: only the definition directories are checked out,
+    # and only their blobs are fetched.
+    commands = [
+        [
+            "git", "clone", "--filter=blob:none", "--no-checkout", "--depth", "1",
+            "--branch", branch, repo_url, str(repo_path),
+        ],
+        ["git", "-C", str(repo_path), "sparse-checkout", "init", "--cone"],
+        ["git", "-C", str(repo_path), "sparse-checkout", "set", *_DEFINITION_DIRS],
+        ["git", "-C", str(repo_path), "checkout", branch],
+    ]
+    for command in commands:
+        subprocess.run(command, check=True, capture_output=True)
     return repo_path
 
 
@@ -168,46 +210,78 @@ def _prepare_repo(branch: str, base_dir: Path, *, repo_url: str, repo_path: Opti
 
 
 async def _upsert_tools(session_factory, tools: list[ToolDefinition]) -> None:
+    if not tools:
+        return
     async with session_factory() as session:
-        repo = ToolRepository(session)
-        for tool in tools:
-            existing = await session.scalar(select(Tool).where(Tool.name == tool.name))
-            if existing:
-                await repo.update(
-                    existing.id,
-                    name=tool.name,
-                    description=tool.description,
-                    python_entrypoint=tool.python_entrypoint,
-                    config=tool.config,
-                    is_active=tool.is_active,
-                )
-            else:
-                await repo.create(
-                    name=tool.name,
-                    description=tool.description,
-                    python_entrypoint=tool.python_entrypoint,
-                    config=tool.config,
-                    is_active=tool.is_active,
-                )
+        connection = await session.connection()
+        insert = _UPSERT_INSERTS.get(connection.dialect.name)
+        if insert is None:
+            await _upsert_tools_one_by_one(session, tools)
+        else:
+            # One INSERT ... ON CONFLICT (name) DO UPDATE for the whole branch.
+            # A statement cannot touch a row twice, so keep one definition per
+            # name; the last one wins, as with the row-by-row upsert.
+            rows = {
+                tool.name: {
+                    "name": tool.name,
+                    "description": tool.description,
+                    "python_entrypoint": tool.python_entrypoint,
+                    "config": tool.config,
+                    "is_active": tool.is_active,
+                }
+                for tool in tools
+            }
+            stmt = insert(Tool).values(list(rows.values()))
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Tool.name],
+                set_={
+                    "description": stmt.excluded.description,
+                    "python_entrypoint": stmt.excluded.python_entrypoint,
+                    "config": stmt.excluded.config,
+                    "is_active": stmt.excluded.is_active,
+                    "updated_at": datetime.utcnow(),
+                },
+            )
+            await session.execute(stmt)
         await session.commit()
 
 
-async def _ensure_template(session_factory, name: str, description: Optional[str]) -> AgentTemplate:
-    async with session_factory() as session:
-        existing = await session.scalar(select(AgentTemplate).where(AgentTemplate.name == name))
+async def _upsert_tools_one_by_one(session, tools: list[ToolDefinition]) -> None:
+    repo = ToolRepository(session)
+    for tool in tools:
+        existing = await session.scalar(select(Tool).where(Tool.name == tool.name))
         if existing:
-            return existing
-    template_service = TemplateService(session_factory)
-    return await template_service.create(name=name, description=description)
+            await repo.update(
+                existing.id,
+                name=tool.name,
+                description=tool.description,
+                python_entrypoint=tool.python_entrypoint,
+                config=tool.config,
+                is_active=tool.is_active,
+            )
+        else:
+            await repo.create(
+                name=tool.name,
+                description=tool.description,
+                python_entrypoint=tool.python_entrypoint,
+                config=tool.config,
+                is_active=tool.is_active,
+            )
 
 
-async def _version_exists(session_factory, template_id: str, agent_def: AgentDefinition) -> Optional[TemplateVersion]:
-    async with session_factory() as session:
-        stmt = select(TemplateVersion).where(
-            TemplateVersion.template_id == template_id,
-            TemplateVersion.prompt == agent_def.prompt,
-        )
-        return await session.scalar(stmt)
+async def _ensure_template(session, name: str, description: Optional[str]) -> AgentTemplate:
+    existing = await session.scalar(select(AgentTemplate).where(AgentTemplate.name == name))
+    if existing:
+        return existing
+    return await TemplateRepository(session).create_template(name=name, description=description)
+
+
+async def _version_exists(session, template_id: str, agent_def: AgentDefinition) -> Optional[TemplateVersion]:
+    stmt = select(TemplateVersion).where(
+        TemplateVersion.template_id == template_id,
+        TemplateVersion.prompt == agent_def.prompt,
+    )
+    return await session.scalar(stmt)
 
 
 async def _seed_templates(
@@ -215,25 +289,29 @@ async def _seed_templates(
     template_service: TemplateService,
     agents: list[AgentDefinition],
 ) -> None:
-    for agent in agents:
-        template = await _ensure_template(session_factory, agent.name, agent.description)
-        existing_version = await _version_exists(session_factory, template.id, agent)
-        if existing_version:
-            if agent.activate and not existing_version.is_active:
-                await template_service.activate(template.id, existing_version.id)
-            continue
+    # One transaction for the whole branch instead of several per agent
+    async with session_factory() as session:
+        for agent in agents:
+            template = await _ensure_template(session, agent.name, agent.description)
+            existing_version = await _version_exists(session, template.id, agent)
+            if existing_version:
+                if agent.activate and not existing_version.is_active:
+                    await TemplateRepository(session).activate_version(template.id, existing_version.id)
+                continue
 
-        await template_service.create_version(
-            template.id,
-            llm_policy=agent.llm_policy or LLMPolicy(model=DEFAULT_MODEL),
-            prompts=agent.prompts or PromptConfig().model_dump(),
-            execution_policy=agent.execution_policy or ExecutionPolicy().model_dump(),
-            tool_policy=agent.tool_policy or ToolPolicy().model_dump(),
-            tools=agent.tools,
-            prompt=agent.prompt or agent.prompts.get("system"),
-            activate=agent.activate,
-            rules=agent.rules,
-        )
+            await template_service.create_version(
+                template.id,
+                llm_policy=agent.llm_policy or LLMPolicy(model=DEFAULT_MODEL),
+                prompts=agent.prompts or PromptConfig().model_dump(),
+                execution_policy=agent.execution_policy or ExecutionPolicy().model_dump(),
+                tool_policy=agent.tool_policy or ToolPolicy().model_dump(),
+                tools=agent.tools,
+                prompt=agent.prompt or agent.prompts.get("system"),
+                activate=agent.activate,
+                rules=agent.rules,
+                session=session,
+            )
+        await session.commit()
 
 
 async def seed_branch(
@@ -263,8 +341,18 @@ async def main_async(args: argparse.Namespace) -> None:
     try:
         with tempfile.TemporaryDirectory() as tmpdir:
             base_dir = Path(tmpdir)
-            for branch in args.branch:
-                repo_path = _prepare_repo(branch, base_dir, repo_url=args.repo_url, repo_path=args.repo_path)
+            # Branches are independent, so clone/checkout them all at once; a
+            # repeated --branch would race on the same target, hence the dedupe.
+            branches = list(dict.fromkeys(args.branch))
+            repo_paths = await asyncio.gather(
+                *(
+                    asyncio.to_thread(
+                        _prepare_repo, branch, base_dir, repo_url=args.repo_url, repo_path=args.repo_path
+                    )
+                    for branch in branches
+                )
+            )
+            for branch, repo_path in zip(branches, repo_paths):
                 await seed_branch(repo_path, session_factory, template_service, branch=branch)
     finally:
         await engine.dispose()
@@ -294,7 +382,12 @@ def parse_args() -> argparse.Namespace:
 
 def main() -> None:
     args = parse_args()
-    asyncio.run(main_async(args))
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main_async(args))
+    else:
+        uvloop.run(main_async(args))
 
 
 if __name__ == "__main__":
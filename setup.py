@@ -0,0 +1,30 @@
+"""Optional compiled build.
+
+Project metadata lives in pyproject.toml. With MARUNTIME_COMPILED=1 (and
+Cython installed) the hot admin API module is additionally compiled to an
+extension that ships next to its .py source; plain installs stay pure Python.
+"""
+
+from __future__ import annotations
+
+import os
+
+from setuptools import setup
+
+COMPILED_MODULES = ["src/maruntime/admin/main.py"]
+
+ext_modules = []
+if os.getenv("MARUNTIME_COMPILED") == "1":
+    from Cython.Build import cythonize
+
+    # binding=True keeps real function objects with signatures, which FastAPI
+    # needs to introspect route parameters and dependencies. annotation_typing
+    # is off because Cython would otherwise enforce `x: str | None = Header()`
+    # style annotations as C-level type checks and fail at import time.
+    ext_modules = cythonize(
+        COMPILED_MODULES,
+        language_level=3,
+        compiler_directives={"binding": True, "annotation_typing": False},
+    )
+
+setup(ext_modules=ext_modules)
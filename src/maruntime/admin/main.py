@@ -1,15 +1,25 @@
 from __future__ import annotations
 
+import functools
+import hashlib
+import hmac
+import logging
 import os
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Callable, Optional, TypeVar
 
-from fastapi import Depends, FastAPI, Header, HTTPException, status
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, Response, status
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, ConfigDict, Field
-from sqlalchemy import select
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError
+from sqlalchemy import Row, Select, event, inspect, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 from sqlalchemy.orm import selectinload
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from maruntime.persistence import (
     AgentInstance,
@@ -17,9 +27,9 @@ from maruntime.persistence import (
     Session as SessionModel,
     SystemPrompt,
     TemplateVersion,
-    Tool,
     create_engine,
     create_session_factory,
+    pooled_engine_options,
 )
 from maruntime.persistence.repositories import AgentInstanceRepository, SystemPromptRepository, TemplateRepository, ToolRepository
 from maruntime.runtime.templates import ExecutionPolicy, LLMPolicy, PromptConfig, TemplateService, ToolPolicy
@@ -29,10 +39,37 @@ from maruntime.core.services.prompt_loader import (
     DEFAULT_CLARIFICATION_RESPONSE,
 )
 
+logger = logging.getLogger(__name__)
+
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./dev.db")
 ADMIN_API_KEY = os.getenv("ADMIN_API_KEY")
+# Default and maximum page size of GET /sessions
+MAX_SESSION_LIST = int(os.getenv("MAX_SESSION_LIST", "500"))
+
+
+_SQLITE_PRAGMAS = (
+    # WAL lets readers run alongside the writer and, with synchronous=NORMAL,
+    # fsyncs at checkpoints instead of on every commit.
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
 
-engine: AsyncEngine = create_engine(DATABASE_URL)
+
+engine: AsyncEngine = create_engine(DATABASE_URL, **pooled_engine_options(DATABASE_URL))
+if engine.dialect.name == "sqlite":
+    event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
 session_factory = create_session_factory(engine)
 template_service = TemplateService(session_factory)
 
@@ -66,6 +103,11 @@ class ToolUpdate(BaseModel):
     is_active: Optional[bool] = None
 
 
+# Read models are built once per row and never mutated afterwards; extra
+# attributes on the ORM object are ignored rather than checked.
+_READ_MODEL_CONFIG = ConfigDict(from_attributes=True, frozen=True, extra="ignore")
+
+
 class ToolRead(BaseModel):
     id: str
     name: str
@@ -77,7 +119,7 @@ class ToolRead(BaseModel):
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = _READ_MODEL_CONFIG
 
 
 class TemplateCreate(BaseModel):
@@ -107,7 +149,7 @@ class TemplateVersionRead(BaseModel):
     is_active: bool
     created_at: Optional[datetime] = None
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = _READ_MODEL_CONFIG
 
 
 class TemplateRead(BaseModel):
@@ -119,7 +161,7 @@ class TemplateRead(BaseModel):
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = _READ_MODEL_CONFIG
 
 
 class SessionRead(BaseModel):
@@ -132,7 +174,7 @@ class SessionRead(BaseModel):
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = _READ_MODEL_CONFIG
 
 
 class AgentInstanceRead(BaseModel):
@@ -161,7 +203,7 @@ class AgentInstanceRead(BaseModel):
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = _READ_MODEL_CONFIG
 
 
 class AgentInstanceCreate(BaseModel):
@@ -188,14 +230,211 @@ class AgentInstanceUpdate(BaseModel):
     config_overrides: Optional[dict[str, Any]] = None
 
 
-async def require_api_key(x_api_key: str | None = Header(default=None, alias="X-API-Key")) -> None:
-    if ADMIN_API_KEY and x_api_key != ADMIN_API_KEY:
+ReadModelT = TypeVar("ReadModelT", bound=BaseModel)
+
+# List endpoints serialize straight to JSON bytes in pydantic-core instead of
+# going through jsonable_encoder and json.dumps.
+_TOOL_LIST = TypeAdapter(list[ToolRead])
+_TEMPLATE_LIST = TypeAdapter(list[TemplateRead])
+_TEMPLATE_VERSION_LIST = TypeAdapter(list[TemplateVersionRead])
+_SESSION_LIST = TypeAdapter(list[SessionRead])
+_AGENT_INSTANCE_LIST = TypeAdapter(list[AgentInstanceRead])
+
+
+@functools.cache
+def _column_keys(model_cls: type[BaseModel], orm_cls: type) -> tuple[str, ...]:
+    """Fields of ``model_cls`` that are mapped columns of ``orm_cls``, computed once per pair."""
+    columns = {attr.key for attr in inspect(orm_cls).column_attrs}
+    return tuple(name for name in model_cls.model_fields if name in columns)
+
+
+def _fast_read(model_cls: type[ReadModelT], orm_obj: Any, **extra: Any) -> ReadModelT:
+    """Build a read model from a loaded ORM row without re-validating its columns.
+
+    Column values already have their Python types, so this is used on read
+    paths; request payloads still go through full validation.
+    """
+    data = {key: getattr(orm_obj, key) for key in _column_keys(model_cls, type(orm_obj))}
+    data.update(extra)
+    return model_cls.model_construct(**data)
+
+
+def _json_list(adapter: TypeAdapter, items: list[BaseModel]) -> Response:
+    return Response(content=adapter.dump_json(items), media_type="application/json")
+
+
+_STREAM_BATCH_SIZE = 500
+
+
+async def _stream_json_list(
+    adapter: TypeAdapter, stmt: Select, to_read: Callable[[Row], BaseModel]
+) -> StreamingResponse:
+    """Stream a JSON array of read models, holding at most one batch of rows.
+
+    The body opens its own session: the request-scoped one from get_session
+    may already be closed while the response is still being sent. The query
+    runs and the first batch is fetched before the response starts, so those
+    errors still surface as a normal error status. A failure on a later batch
+    is logged and re-raised, which aborts the chunked body instead of ending
+    it as if the array were complete.
+    """
+
+    async def body() -> AsyncIterator[bytes]:
+        async with session_factory() as session:
+            result = await session.stream(stmt.execution_options(yield_per=_STREAM_BATCH_SIZE))
+            batches = result.partitions()
+            first = await anext(batches, None)
+            # Dump each batch as a list and drop its brackets to splice it in.
+            yield b"[" + (adapter.dump_json([to_read(row) for row in first])[1:-1] if first else b"")
+            try:
+                async for rows in batches:
+                    yield b"," + adapter.dump_json([to_read(row) for row in rows])[1:-1]
+            except Exception:
+                logger.exception("Aborting streamed JSON list after a failed batch")
+                raise
+            yield b"]"
+
+    chunks = body()
+    head = await anext(chunks)
+
+    async def resume() -> AsyncIterator[bytes]:
+        yield head
+        async for chunk in chunks:
+            yield chunk
+
+    return StreamingResponse(resume(), media_type="application/json")
+
+
+def _version_read(version: TemplateVersion) -> TemplateVersionRead:
+    return _fast_read(TemplateVersionRead, version)
+
+
+def _template_read(template: AgentTemplate) -> TemplateRead:
+    return _fast_read(
+        TemplateRead,
+        template,
+        versions=[_version_read(version) for version in template.versions],
+    )
+
+
+async def _check_api_key(x_api_key: str | None = Header(default=None, alias="X-API-Key")) -> None:
+    if not hmac.compare_digest((x_api_key or "").encode(), ADMIN_API_KEY.encode()):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or missing API key")
 
 
+async def _api_key_not_required() -> None:
+    return None
+
+
+# Chosen once at import: without a configured key the dependency has no
+# parameters, so FastAPI does not even read the header.
+require_api_key = _check_api_key if ADMIN_API_KEY else _api_key_not_required
+
+
+# Holds the request's session once a handler asks for one; the list itself is
+# set per request so handlers and the middleware see the same object.
+_request_session: ContextVar[list[AsyncSession]] = ContextVar("admin_request_session")
+
+
+class RequestSessionMiddleware:
+    """Close the request-scoped session after the response has been sent."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        holder: list[AsyncSession] = []
+        token = _request_session.set(holder)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_session.reset(token)
+            if holder:
+                # Handlers commit what they change; anything else is rolled back.
+                await holder[0].close()
+
+
+app.add_middleware(RequestSessionMiddleware)
+
+
 async def get_session() -> AsyncSession:
-    async with session_factory() as session:
-        yield session
+    """Return the request's session, opening it on first use.
+
+    Every Depends(get_session) in one request shares the same session, and no
+    generator dependency has to be torn down per call.
+    """
+    holder = _request_session.get()
+    if not holder:
+        holder.append(session_factory())
+    return holder[0]
+
+
+@asynccontextmanager
+async def _conflict_on_duplicate(session: AsyncSession, detail: str) -> AsyncIterator[None]:
+    """Turn a unique-index violation raised on flush/commit into a 409.
+
+    The database index is the source of truth for name uniqueness, so writes
+    skip a SELECT pre-check and cannot race a concurrent create.
+    """
+    try:
+        yield
+    except IntegrityError as exc:
+        if not _is_unique_violation(exc):
+            raise
+        await session.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail) from exc
+
+
+def _is_unique_violation(exc: IntegrityError) -> bool:
+    """True for unique-constraint failures; FK and NOT NULL ones stay errors."""
+    orig = exc.orig
+    # psycopg and the asyncpg adapter expose the SQLSTATE (23505 = unique_violation)
+    sqlstate = getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None)
+    if sqlstate is not None:
+        return sqlstate == "23505"
+    # sqlite3 (Python 3.11+) names the extended result code
+    errorname = getattr(orig, "sqlite_errorname", None)
+    if errorname is not None:
+        return errorname in {"SQLITE_CONSTRAINT_UNIQUE", "SQLITE_CONSTRAINT_PRIMARYKEY"}
+    return str(orig).startswith("UNIQUE constraint failed")
+
+
+BodyT = TypeVar("BodyT", bound=BaseModel)
+
+
+def _json_body(model_cls: type[BodyT]) -> Any:
+    """Depends() on the request body parsed by a TypeAdapter built once per model.
+
+    pydantic-core validates the raw JSON bytes in one pass instead of FastAPI's
+    json.loads followed by validation of the resulting dict. Errors are raised
+    as RequestValidationError so 422 responses keep FastAPI's shape.
+    """
+    adapter = TypeAdapter(model_cls)
+
+    async def parse_body(request: Request) -> BodyT:
+        body = await request.body()
+        if not body:
+            raise RequestValidationError([{"type": "missing", "loc": ("body",), "msg": "Field required", "input": None}])
+        try:
+            return adapter.validate_json(body)
+        except ValidationError as exc:
+            errors = [{**error, "loc": ("body", *error["loc"])} for error in exc.errors(include_url=False)]
+            raise RequestValidationError(errors) from exc
+
+    return Depends(parse_body)
+
+
+def _json_body_openapi(model_cls: type[BaseModel]) -> dict[str, Any]:
+    # Bodies read through _json_body are invisible to FastAPI, so document them here
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": model_cls.model_json_schema()}},
+        }
+    }
 
 
 @app.on_event("shutdown")
@@ -212,25 +451,29 @@ async def healthcheck() -> dict[str, str]:
 async def list_tools(active_only: Optional[bool] = None, session: AsyncSession = Depends(get_session)) -> list[ToolRead]:
     repo = ToolRepository(session)
     tools = await repo.list(active_only=active_only)
-    return [ToolRead.model_validate(tool) for tool in tools]
+    return _json_list(_TOOL_LIST, [_fast_read(ToolRead, tool) for tool in tools])
 
 
-@app.post("/tools", response_model=ToolRead, status_code=status.HTTP_201_CREATED, dependencies=[Depends(require_api_key)])
-async def create_tool(payload: ToolCreate, session: AsyncSession = Depends(get_session)) -> ToolRead:
-    existing = await session.scalar(select(Tool).where(Tool.name == payload.name))
-    if existing:
-        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Tool with this name already exists")
-
+@app.post(
+    "/tools",
+    response_model=ToolRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(require_api_key)],
+    openapi_extra=_json_body_openapi(ToolCreate),
+)
+async def create_tool(
+    payload: ToolCreate = _json_body(ToolCreate), session: AsyncSession = Depends(get_session)
+) -> ToolRead:
     repo = ToolRepository(session)
-    tool = await repo.create(
-        name=payload.name,
-        description=payload.description,
-        python_entrypoint=payload.python_entrypoint,
-        config=payload.config,
-        is_active=payload.is_active,
-    )
-    await session.commit()
-    await session.refresh(tool)
+    async with _conflict_on_duplicate(session, "Tool with this name already exists"):
+        tool = await repo.create(
+            name=payload.name,
+            description=payload.description,
+            python_entrypoint=payload.python_entrypoint,
+            config=payload.config,
+            is_active=payload.is_active,
+        )
+        await session.commit()
     return ToolRead.model_validate(tool)
 
 
@@ -240,11 +483,18 @@ async def get_tool(tool_id: str, session: AsyncSession = Depends(get_session)) -
     tool = await repo.get(tool_id)
     if tool is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tool not found")
-    return ToolRead.model_validate(tool)
+    return _fast_read(ToolRead, tool)
 
 
-@app.patch("/tools/{tool_id}", response_model=ToolRead, dependencies=[Depends(require_api_key)])
-async def update_tool(tool_id: str, payload: ToolUpdate, session: AsyncSession = Depends(get_session)) -> ToolRead:
+@app.patch(
+    "/tools/{tool_id}",
+    response_model=ToolRead,
+    dependencies=[Depends(require_api_key)],
+    openapi_extra=_json_body_openapi(ToolUpdate),
+)
+async def update_tool(
+    tool_id: str, payload: ToolUpdate = _json_body(ToolUpdate), session: AsyncSession = Depends(get_session)
+) -> ToolRead:
     repo = ToolRepository(session)
     tool = await repo.update(
         tool_id,
@@ -257,7 +507,6 @@ async def update_tool(tool_id: str, payload: ToolUpdate, session: AsyncSession =
     if tool is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tool not found")
     await session.commit()
-    await session.refresh(tool)
     return ToolRead.model_validate(tool)
 
 
@@ -268,22 +517,25 @@ async def _load_template(session: AsyncSession, template_id: str) -> AgentTempla
         .where(AgentTemplate.id == template_id)
     )
     result = await session.scalars(stmt)
-    template = result.first()
-    if template:
-        template.versions.sort(key=lambda v: v.version)
-    return template
+    return result.first()
 
 
-@app.post("/templates", response_model=TemplateRead, status_code=status.HTTP_201_CREATED, dependencies=[Depends(require_api_key)])
-async def create_template(payload: TemplateCreate, session: AsyncSession = Depends(get_session)) -> TemplateRead:
-    existing = await session.scalar(select(AgentTemplate).where(AgentTemplate.name == payload.name))
-    if existing:
-        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Template with this name already exists")
+@app.post(
+    "/templates",
+    response_model=TemplateRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(require_api_key)],
+    openapi_extra=_json_body_openapi(TemplateCreate),
+)
+async def create_template(
+    payload: TemplateCreate = _json_body(TemplateCreate), session: AsyncSession = Depends(get_session)
+) -> TemplateRead:
     repo = TemplateRepository(session)
-    template = await repo.create_template(name=payload.name, description=payload.description)
-    await session.commit()
-    await session.refresh(template)
-    return TemplateRead.model_validate(template)
+    async with _conflict_on_duplicate(session, "Template with this name already exists"):
+        template = await repo.create_template(name=payload.name, description=payload.description)
+        await session.commit()
+    # A new template has no versions; skip the lazy load model_validate would trigger
+    return _fast_read(TemplateRead, template, versions=[])
 
 
 @app.get("/templates", response_model=list[TemplateRead], dependencies=[Depends(require_api_key)])
@@ -291,9 +543,7 @@ async def list_templates(session: AsyncSession = Depends(get_session)) -> list[T
     stmt = select(AgentTemplate).options(selectinload(AgentTemplate.versions)).order_by(AgentTemplate.created_at)
     result = await session.scalars(stmt)
     templates = result.all()
-    for template in templates:
-        template.versions.sort(key=lambda v: v.version)
-    return [TemplateRead.model_validate(template) for template in templates]
+    return _json_list(_TEMPLATE_LIST, [_template_read(template) for template in templates])
 
 
 @app.get("/templates/{template_id}", response_model=TemplateRead, dependencies=[Depends(require_api_key)])
@@ -301,7 +551,7 @@ async def get_template(template_id: str, session: AsyncSession = Depends(get_ses
     template = await _load_template(session, template_id)
     if template is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Template not found")
-    return TemplateRead.model_validate(template)
+    return _template_read(template)
 
 
 @app.post(
@@ -342,7 +592,7 @@ async def list_template_versions(template_id: str, session: AsyncSession = Depen
     stmt = select(TemplateVersion).where(TemplateVersion.template_id == template_id).order_by(TemplateVersion.version)
     result = await session.scalars(stmt)
     versions = result.all()
-    return [TemplateVersionRead.model_validate(version) for version in versions]
+    return _json_list(_TEMPLATE_VERSION_LIST, [_version_read(version) for version in versions])
 
 
 @app.post(
@@ -367,11 +617,12 @@ class TemplateVersionPromptUpdate(BaseModel):
     "/templates/{template_id}/versions/{version_id}/prompt",
     response_model=TemplateVersionRead,
     dependencies=[Depends(require_api_key)],
+    openapi_extra=_json_body_openapi(TemplateVersionPromptUpdate),
 )
 async def update_template_version_prompt(
     template_id: str,
     version_id: str,
-    payload: TemplateVersionPromptUpdate,
+    payload: TemplateVersionPromptUpdate = _json_body(TemplateVersionPromptUpdate),
     session: AsyncSession = Depends(get_session),
 ) -> TemplateVersionRead:
     """Update the system prompt of a template version."""
@@ -380,15 +631,12 @@ async def update_template_version_prompt(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Template version not found")
     
     # Update settings.prompts.system_prompt
-    settings = dict(version.settings) if version.settings else {}
-    if "prompts" not in settings:
-        settings["prompts"] = {}
-    settings["prompts"]["system_prompt"] = payload.system_prompt
-    
-    version.settings = settings
+    if version.settings is None:
+        version.settings = {}
+    version.settings.setdefault("prompts", {})["system_prompt"] = payload.system_prompt
+    # MutableDict only sees top-level writes; flag the nested one explicitly
+    version.settings.changed()
     await session.commit()
-    await session.refresh(version)
-    
     return TemplateVersionRead.model_validate(version)
 
 
@@ -397,42 +645,48 @@ async def list_sessions(
     template_version_id: Optional[str] = None,
     instance_id: Optional[str] = None,
     state: Optional[str] = None,
-    session: AsyncSession = Depends(get_session),
+    limit: int = Query(MAX_SESSION_LIST, ge=1, le=MAX_SESSION_LIST),
+    offset: int = Query(0, ge=0),
 ) -> list[SessionRead]:
-    """List sessions with optional filters."""
-    stmt = select(SessionModel).options(selectinload(SessionModel.instance))
+    """List sessions with optional filters, newest first.
+
+    Returns at most ``limit`` sessions (MAX_SESSION_LIST by default); page
+    through the rest with ``offset``.
+    """
+    # Only the instance name is needed, so join for that column instead of
+    # loading whole AgentInstance rows with a second query.
+    stmt = select(SessionModel, AgentInstance.name).outerjoin(
+        AgentInstance, SessionModel.instance_id == AgentInstance.id
+    )
     if template_version_id:
         stmt = stmt.where(SessionModel.template_version_id == template_version_id)
     if instance_id:
         stmt = stmt.where(SessionModel.instance_id == instance_id)
     if state:
         stmt = stmt.where(SessionModel.state == state)
-    stmt = stmt.order_by(SessionModel.created_at.desc())
-    result = await session.scalars(stmt)
-    sessions = result.all()
-
-    # Build response with instance name
-    response = []
-    for sess in sessions:
-        data = SessionRead.model_validate(sess)
-        if sess.instance:
-            data.instance_name = sess.instance.name
-        response.append(data)
-    return response
+    # Each filter has a (column, created_at) index, so this is an index range
+    # scan that stops after offset + limit rows.
+    stmt = stmt.order_by(SessionModel.created_at.desc()).offset(offset).limit(limit)
+    return await _stream_json_list(
+        _SESSION_LIST,
+        stmt,
+        lambda row: _fast_read(SessionRead, row[0], instance_name=row[1]),
+    )
 
 
 @app.get("/sessions/{session_id}", response_model=SessionRead, dependencies=[Depends(require_api_key)])
 async def get_session_by_id(session_id: str, session: AsyncSession = Depends(get_session)) -> SessionRead:
     """Get a specific session by ID."""
-    stmt = select(SessionModel).options(selectinload(SessionModel.instance)).where(SessionModel.id == session_id)
-    result = await session.scalars(stmt)
-    sess = result.first()
-    if sess is None:
+    stmt = (
+        select(SessionModel, AgentInstance.name)
+        .outerjoin(AgentInstance, SessionModel.instance_id == AgentInstance.id)
+        .where(SessionModel.id == session_id)
+    )
+    row = (await session.execute(stmt)).first()
+    if row is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found")
-    data = SessionRead.model_validate(sess)
-    if sess.instance:
-        data.instance_name = sess.instance.name
-    return data
+    sess, instance_name = row
+    return _fast_read(SessionRead, sess, instance_name=instance_name)
 
 
 @app.get("/instances", response_model=list[AgentInstanceRead], dependencies=[Depends(require_api_key)])
@@ -441,44 +695,42 @@ async def list_agent_instances(
     template_version_id: Optional[str] = None,
     status_filter: Optional[str] = None,
     is_enabled: Optional[bool] = None,
-    session: AsyncSession = Depends(get_session),
 ) -> list[AgentInstanceRead]:
     """List all agent instances with optional filters."""
-    repo = AgentInstanceRepository(session)
-    instances = await repo.list(
+    stmt = AgentInstanceRepository.list_statement(
         template_id=template_id,
         template_version_id=template_version_id,
         status=status_filter,
         is_enabled=is_enabled,
     )
-    return [AgentInstanceRead.model_validate(instance) for instance in instances]
+    return await _stream_json_list(_AGENT_INSTANCE_LIST, stmt, lambda row: _fast_read(AgentInstanceRead, row[0]))
 
 
-@app.post("/instances", response_model=AgentInstanceRead, status_code=status.HTTP_201_CREATED, dependencies=[Depends(require_api_key)])
+@app.post(
+    "/instances",
+    response_model=AgentInstanceRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(require_api_key)],
+    openapi_extra=_json_body_openapi(AgentInstanceCreate),
+)
 async def create_agent_instance(
-    payload: AgentInstanceCreate,
+    payload: AgentInstanceCreate = _json_body(AgentInstanceCreate),
     session: AsyncSession = Depends(get_session),
 ) -> AgentInstanceRead:
     """Create a new named agent instance."""
     repo = AgentInstanceRepository(session)
-
-    # Check if name is unique
-    existing = await repo.get_by_name(payload.name)
-    if existing:
-        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Instance with this name already exists")
-
-    instance = await repo.create(
-        name=payload.name,
-        display_name=payload.display_name,
-        description=payload.description,
-        template_version_id=payload.template_version_id,
-        is_enabled=payload.is_enabled,
-        auto_start=payload.auto_start,
-        priority=payload.priority,
-        config_overrides=payload.config_overrides,
-    )
-    await session.commit()
-    await session.refresh(instance)
+    async with _conflict_on_duplicate(session, "Instance with this name already exists"):
+        instance = await repo.create(
+            name=payload.name,
+            display_name=payload.display_name,
+            description=payload.description,
+            template_version_id=payload.template_version_id,
+            is_enabled=payload.is_enabled,
+            auto_start=payload.auto_start,
+            priority=payload.priority,
+            config_overrides=payload.config_overrides,
+        )
+        await session.commit()
     return AgentInstanceRead.model_validate(instance)
 
 
@@ -489,39 +741,38 @@ async def get_agent_instance(instance_id: str, session: AsyncSession = Depends(g
     instance = await repo.get(instance_id)
     if instance is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Instance not found")
-    return AgentInstanceRead.model_validate(instance)
+    return _fast_read(AgentInstanceRead, instance)
 
 
-@app.patch("/instances/{instance_id}", response_model=AgentInstanceRead, dependencies=[Depends(require_api_key)])
+@app.patch(
+    "/instances/{instance_id}",
+    response_model=AgentInstanceRead,
+    dependencies=[Depends(require_api_key)],
+    openapi_extra=_json_body_openapi(AgentInstanceUpdate),
+)
 async def update_agent_instance(
     instance_id: str,
-    payload: AgentInstanceUpdate,
+    payload: AgentInstanceUpdate = _json_body(AgentInstanceUpdate),
     session: AsyncSession = Depends(get_session),
 ) -> AgentInstanceRead:
     """Update an agent instance configuration."""
     repo = AgentInstanceRepository(session)
-
-    # Check name uniqueness if being changed
-    if payload.name:
-        existing = await repo.get_by_name(payload.name)
-        if existing and existing.id != instance_id:
-            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Instance with this name already exists")
-
-    instance = await repo.update(
-        instance_id,
-        name=payload.name,
-        display_name=payload.display_name,
-        description=payload.description,
-        template_version_id=payload.template_version_id,
-        is_enabled=payload.is_enabled,
-        auto_start=payload.auto_start,
-        priority=payload.priority,
-        config_overrides=payload.config_overrides,
-    )
-    if instance is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Instance not found")
-    await session.commit()
-    await session.refresh(instance)
+    # A rename that collides with another instance fails on the unique index
+    async with _conflict_on_duplicate(session, "Instance with this name already exists"):
+        instance = await repo.update(
+            instance_id,
+            name=payload.name,
+            display_name=payload.display_name,
+            description=payload.description,
+            template_version_id=payload.template_version_id,
+            is_enabled=payload.is_enabled,
+            auto_start=payload.auto_start,
+            priority=payload.priority,
+            config_overrides=payload.config_overrides,
+        )
+        if instance is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Instance not found")
+        await session.commit()
     return AgentInstanceRead.model_validate(instance)
 
 
@@ -543,7 +794,6 @@ async def start_agent_instance(instance_id: str, session: AsyncSession = Depends
     if instance is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Instance not found")
     await session.commit()
-    await session.refresh(instance)
     return AgentInstanceRead.model_validate(instance)
 
 
@@ -555,7 +805,6 @@ async def stop_agent_instance(instance_id: str, session: AsyncSession = Depends(
     if instance is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Instance not found")
     await session.commit()
-    await session.refresh(instance)
     return AgentInstanceRead.model_validate(instance)
 
 
@@ -574,7 +823,10 @@ class SystemPromptRead(BaseModel):
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = _READ_MODEL_CONFIG
+
+
+_SYSTEM_PROMPT_LIST = TypeAdapter(list[SystemPromptRead])
 
 
 class SystemPromptUpdate(BaseModel):
@@ -600,6 +852,14 @@ _PROMPT_DEFAULTS = {
     "clarification": DEFAULT_CLARIFICATION_RESPONSE,
 }
 
+# The defaults never change at runtime, so serialize them once
+_PROMPT_DEFAULTS_BODY = SystemPromptDefaultsResponse(
+    system=DEFAULT_SYSTEM_PROMPT,
+    initial_user=DEFAULT_INITIAL_USER_REQUEST,
+    clarification=DEFAULT_CLARIFICATION_RESPONSE,
+).model_dump_json().encode()
+_PROMPT_DEFAULTS_ETAG = f'"{hashlib.blake2b(_PROMPT_DEFAULTS_BODY, digest_size=8).hexdigest()}"'
+
 
 @app.get("/prompts", response_model=list[SystemPromptRead], dependencies=[Depends(require_api_key)])
 async def list_system_prompts(
@@ -609,17 +869,16 @@ async def list_system_prompts(
     """List all system prompts."""
     repo = SystemPromptRepository(session)
     prompts = await repo.list(active_only=active_only)
-    return [SystemPromptRead.model_validate(prompt) for prompt in prompts]
+    return _json_list(_SYSTEM_PROMPT_LIST, [_fast_read(SystemPromptRead, prompt) for prompt in prompts])
 
 
 @app.get("/prompts/defaults", response_model=SystemPromptDefaultsResponse, dependencies=[Depends(require_api_key)])
-async def get_prompt_defaults() -> SystemPromptDefaultsResponse:
+async def get_prompt_defaults(request: Request) -> Response:
     """Get the hardcoded default prompts for reference or reset."""
-    return SystemPromptDefaultsResponse(
-        system=DEFAULT_SYSTEM_PROMPT,
-        initial_user=DEFAULT_INITIAL_USER_REQUEST,
-        clarification=DEFAULT_CLARIFICATION_RESPONSE,
-    )
+    headers = {"ETag": _PROMPT_DEFAULTS_ETAG}
+    if request.headers.get("if-none-match") == _PROMPT_DEFAULTS_ETAG:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=_PROMPT_DEFAULTS_BODY, media_type="application/json", headers=headers)
 
 
 @app.get("/prompts/{prompt_id}", response_model=SystemPromptRead, dependencies=[Depends(require_api_key)])
@@ -629,13 +888,18 @@ async def get_system_prompt(prompt_id: str, session: AsyncSession = Depends(get_
     prompt = await repo.get(prompt_id)
     if prompt is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="System prompt not found")
-    return SystemPromptRead.model_validate(prompt)
+    return _fast_read(SystemPromptRead, prompt)
 
 
-@app.patch("/prompts/{prompt_id}", response_model=SystemPromptRead, dependencies=[Depends(require_api_key)])
+@app.patch(
+    "/prompts/{prompt_id}",
+    response_model=SystemPromptRead,
+    dependencies=[Depends(require_api_key)],
+    openapi_extra=_json_body_openapi(SystemPromptUpdate),
+)
 async def update_system_prompt(
     prompt_id: str,
-    payload: SystemPromptUpdate,
+    payload: SystemPromptUpdate = _json_body(SystemPromptUpdate),
     session: AsyncSession = Depends(get_session),
 ) -> SystemPromptRead:
     """Update a system prompt."""
@@ -651,7 +915,6 @@ async def update_system_prompt(
     if prompt is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="System prompt not found")
     await session.commit()
-    await session.refresh(prompt)
     return SystemPromptRead.model_validate(prompt)
 
 
@@ -670,5 +933,4 @@ async def reset_system_prompt(prompt_id: str, session: AsyncSession = Depends(ge
     if prompt is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="System prompt not found")
     await session.commit()
-    await session.refresh(prompt)
     return SystemPromptRead.model_validate(prompt)
@@ -22,6 +22,11 @@ class AuthMiddleware(BaseHTTPMiddleware):
     
     Public endpoints (not requiring auth) can check `request.state.user is None`.
     Protected endpoints should use the `get_current_user` dependency.
+
+    Repeat requests from a session are answered by the session cache in
+    `AuthService.validate_session`, which honours the session expiry and is
+    cleared on logout, password and profile changes; the database session
+    opened here only connects on a cache miss.
     """
 
     def __init__(
@@ -39,14 +44,23 @@ class AuthMiddleware(BaseHTTPMiddleware):
         """
         super().__init__(app)
         self.session_factory = session_factory
-        self.exclude_paths = set(exclude_paths or [])
+        self.exclude_paths = frozenset(exclude_paths or ())
 
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         """Process request and validate auth if session cookie present."""
+        # The raw scope path avoids building request.url for every request
+        path = request.scope["path"]
+        # CORS preflights and health probes never carry a user
+        if request.method == "OPTIONS" or path == "/health":
+            return await call_next(request)
+
         # Initialize user as None
         request.state.user = None
         request.state.user_id = None
 
+        if path in self.exclude_paths:
+            return await call_next(request)
+
         # Get session token from cookie
         token = request.cookies.get(SESSION_COOKIE_NAME)
         
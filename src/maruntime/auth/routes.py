@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Callable
 
 from fastapi import APIRouter, Depends, HTTPException, Response, Request
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from maruntime.auth.service import (
@@ -42,14 +43,14 @@ class UpdateProfileRequest(BaseModel):
 
 
 class UserResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
     id: str
     login: str
     display_name: str
     about: str | None
-    created_at: str
-
-    class Config:
-        from_attributes = True
+    # Serialized to ISO 8601 by pydantic along with the rest of the response
+    created_at: datetime
 
 
 def create_auth_router(
@@ -65,21 +66,20 @@ def create_auth_router(
     """
     router = APIRouter(prefix="/auth", tags=["auth"])
 
-    async def get_db() -> AsyncSession:
+    async def get_auth_service() -> AuthService:
         async with session_factory() as session:
-            yield session
+            yield AuthService(session)
 
     @router.post("/register", response_model=UserResponse)
     async def register(
         request: RegisterRequest,
         response: Response,
-        db: AsyncSession = Depends(get_db),
+        auth_service: AuthService = Depends(get_auth_service),
     ) -> UserResponse:
         """Register a new user account."""
-        auth_service = AuthService(db)
-        
         try:
-            user = await auth_service.register(
+            # Registration logs the user in within the same transaction
+            user, token = await auth_service.register_and_login(
                 login=request.login,
                 password=request.password,
                 display_name=request.display_name,
@@ -88,9 +88,6 @@ def create_auth_router(
         except UserExistsError as e:
             raise HTTPException(status_code=400, detail=str(e))
 
-        # Auto-login after registration
-        _, token = await auth_service.login(request.login, request.password)
-        
         # Set session cookie
         response.set_cookie(
             key=SESSION_COOKIE_NAME,
@@ -100,23 +97,15 @@ def create_auth_router(
             samesite="lax",
         )
 
-        return UserResponse(
-            id=user.id,
-            login=user.login,
-            display_name=user.display_name,
-            about=user.about,
-            created_at=user.created_at.isoformat(),
-        )
+        return UserResponse.model_validate(user)
 
     @router.post("/login", response_model=UserResponse)
     async def login(
         request: LoginRequest,
         response: Response,
-        db: AsyncSession = Depends(get_db),
+        auth_service: AuthService = Depends(get_auth_service),
     ) -> UserResponse:
         """Login with credentials and receive session cookie."""
-        auth_service = AuthService(db)
-        
         try:
             user, token = await auth_service.login(request.login, request.password)
         except InvalidCredentialsError as e:
@@ -131,25 +120,18 @@ def create_auth_router(
             samesite="lax",
         )
 
-        return UserResponse(
-            id=user.id,
-            login=user.login,
-            display_name=user.display_name,
-            about=user.about,
-            created_at=user.created_at.isoformat(),
-        )
+        return UserResponse.model_validate(user)
 
     @router.post("/logout")
     async def logout(
         request: Request,
         response: Response,
-        db: AsyncSession = Depends(get_db),
+        auth_service: AuthService = Depends(get_auth_service),
     ) -> dict:
         """Logout and invalidate session."""
         token = request.cookies.get(SESSION_COOKIE_NAME)
         
         if token:
-            auth_service = AuthService(db)
             await auth_service.logout(token)
 
         # Clear cookie
@@ -160,7 +142,7 @@ def create_auth_router(
     @router.get("/me", response_model=UserResponse)
     async def get_current_user(
         request: Request,
-        db: AsyncSession = Depends(get_db),
+        auth_service: AuthService = Depends(get_auth_service),
     ) -> UserResponse:
         """Get current authenticated user."""
         token = request.cookies.get(SESSION_COOKIE_NAME)
@@ -168,25 +150,18 @@ def create_auth_router(
         if not token:
             raise HTTPException(status_code=401, detail="Not authenticated")
 
-        auth_service = AuthService(db)
         user = await auth_service.validate_session(token)
         
         if not user:
             raise HTTPException(status_code=401, detail="Invalid or expired session")
 
-        return UserResponse(
-            id=user.id,
-            login=user.login,
-            display_name=user.display_name,
-            about=user.about,
-            created_at=user.created_at.isoformat(),
-        )
+        return UserResponse.model_validate(user)
 
     @router.put("/password")
     async def change_password(
         request_body: ChangePasswordRequest,
         request: Request,
-        db: AsyncSession = Depends(get_db),
+        auth_service: AuthService = Depends(get_auth_service),
     ) -> dict:
         """Change password for current user."""
         token = request.cookies.get(SESSION_COOKIE_NAME)
@@ -194,7 +169,6 @@ def create_auth_router(
         if not token:
             raise HTTPException(status_code=401, detail="Not authenticated")
 
-        auth_service = AuthService(db)
         user = await auth_service.validate_session(token)
         
         if not user:
@@ -208,7 +182,7 @@ def create_auth_router(
     async def update_profile(
         request_body: UpdateProfileRequest,
         request: Request,
-        db: AsyncSession = Depends(get_db),
+        auth_service: AuthService = Depends(get_auth_service),
     ) -> UserResponse:
         """Update current user profile."""
         token = request.cookies.get(SESSION_COOKIE_NAME)
@@ -216,7 +190,6 @@ def create_auth_router(
         if not token:
             raise HTTPException(status_code=401, detail="Not authenticated")
 
-        auth_service = AuthService(db)
         user = await auth_service.validate_session(token)
         
         if not user:
@@ -231,13 +204,7 @@ def create_auth_router(
         if not updated_user:
             raise HTTPException(status_code=404, detail="User not found")
 
-        return UserResponse(
-            id=updated_user.id,
-            login=updated_user.login,
-            display_name=updated_user.display_name,
-            about=updated_user.about,
-            created_at=updated_user.created_at.isoformat(),
-        )
+        return UserResponse.model_validate(updated_user)
 
     return router
 
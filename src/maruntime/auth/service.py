@@ -2,23 +2,99 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import hashlib
+import logging
+import os
 import secrets
-import uuid
-from datetime import datetime, timedelta
-from typing import Optional
+import time
+from datetime import UTC, datetime, timedelta
+from typing import Callable, Optional
 
 import bcrypt
-from sqlalchemy import select, delete
+from sqlalchemy import bindparam, select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import InvalidHashError, VerificationError
+except ImportError:  # optional: pip install argon2-cffi
+    PasswordHasher = None
+
 from maruntime.core.services.user_memory_service import get_user_memory_service
 from maruntime.persistence.models import User, AuthSession
 
 
+logger = logging.getLogger(__name__)
+
 # Session token expiration (7 days)
 SESSION_EXPIRATION_DAYS = 7
 
+# Seconds a validated token is served from memory; 0 disables the cache
+SESSION_CACHE_TTL = float(os.getenv("AUTH_SESSION_CACHE_TTL", "300"))
+SESSION_CACHE_MAX_ENTRIES = 10_000
+
+# Rows removed per DELETE by cleanup_expired_sessions
+CLEANUP_BATCH_SIZE = 10_000
+
+# Seconds between background runs of cleanup_expired_sessions
+SESSION_CLEANUP_INTERVAL = float(os.getenv("AUTH_SESSION_CLEANUP_INTERVAL", "60"))
+
+# Secret mixed into stored token digests so a leaked auth_sessions table
+# cannot be matched against guessed tokens. Changing it logs everyone out.
+_TOKEN_HASH_SECRET = os.getenv("AUTH_TOKEN_HASH_KEY", "")
+if not _TOKEN_HASH_SECRET:
+    logger.warning(
+        "AUTH_TOKEN_HASH_KEY is not set; session token digests use a public key. "
+        "Set it to a long random secret in every deployment."
+    )
+_TOKEN_HASH_KEY = hashlib.blake2b(_TOKEN_HASH_SECRET.encode()).digest()
+
+# bcrypt work factor for new hashes; existing hashes keep their own cost
+BCRYPT_COST = int(os.getenv("BCRYPT_COST", "12"))
+
+# New passwords are hashed with argon2id instead of bcrypt. Stored hashes of
+# either kind keep verifying, told apart by their "$argon2" prefix.
+ARGON2_ENABLED = os.getenv("ARGON2_ENABLED") == "1"
+if ARGON2_ENABLED and PasswordHasher is None:
+    raise RuntimeError("ARGON2_ENABLED=1 requires the argon2-cffi package")
+_argon2 = PasswordHasher() if PasswordHasher is not None else None
+
+
+# Hashes are stored as bytes, which is what bcrypt produces and consumes.
+def _hash_password_sync(password: str) -> bytes:
+    if ARGON2_ENABLED:
+        return _argon2.hash(password).encode('ascii')
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=BCRYPT_COST))
+
+
+def _check_password_sync(password: str, password_hash: bytes) -> bool:
+    if password_hash.startswith(b"$argon2"):
+        if _argon2 is None:
+            raise RuntimeError("argon2 password hashes require the argon2-cffi package")
+        try:
+            return _argon2.verify(password_hash.decode('ascii'), password)
+        except (VerificationError, InvalidHashError):
+            return False
+    return bcrypt.checkpw(password.encode('utf-8'), password_hash)
+
+
+# Both hashers release the GIL, so worker threads keep the event loop free
+# and still run concurrent logins on separate cores.
+async def _hash_password(password: str) -> bytes:
+    return await asyncio.to_thread(_hash_password_sync, password)
+
+
+async def _check_password(password: str, password_hash: bytes) -> bool:
+    return await asyncio.to_thread(_check_password_sync, password, password_hash)
+
+
+@functools.cache
+def _dummy_password_hash() -> bytes:
+    # Built on first use rather than at import: one hash with the active scheme
+    return _hash_password_sync(secrets.token_hex(16))
+
 
 class AuthError(Exception):
     """Base authentication error."""
@@ -40,9 +116,131 @@ class SessionExpiredError(AuthError):
     pass
 
 
+def _now() -> datetime:
+    """Current time as an aware UTC datetime."""
+    return datetime.now(UTC)
+
+
+def _seconds_until(moment: datetime) -> float:
+    # SQLite hands back naive UTC datetimes, PostgreSQL aware ones
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=UTC)
+    return (moment - _now()).total_seconds()
+
+
+class _SessionCache:
+    """In-process map of validated session tokens to their users.
+
+    Keyed by ``AuthService._token_digest(token)``, never the raw token.
+    Entries live for at most ``ttl`` seconds and never past the session's own
+    expiry. A per-user index lets password and profile changes drop every
+    token of that user at once.
+    """
+
+    def __init__(self, ttl: float, max_entries: int) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: dict[bytes, tuple[float, User]] = {}
+        self._keys_by_user: dict[str, set[bytes]] = {}
+
+    def get(self, key: bytes) -> User | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        deadline, user = entry
+        if deadline <= time.monotonic():
+            self.discard(key)
+            return None
+        return user
+
+    def put(self, key: bytes, user: User, expires_at: datetime) -> None:
+        ttl = min(self.ttl, _seconds_until(expires_at))
+        if ttl <= 0:
+            return
+        if len(self._entries) >= self.max_entries:
+            self._evict()
+        self._entries[key] = (time.monotonic() + ttl, user)
+        self._keys_by_user.setdefault(user.id, set()).add(key)
+
+    def discard(self, key: bytes) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._keys_by_user.get(entry[1].id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[entry[1].id]
+
+    def discard_user(self, user_id: str) -> None:
+        for key in self._keys_by_user.pop(user_id, ()):
+            self._entries.pop(key, None)
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        for key in [key for key, (deadline, _) in self._entries.items() if deadline <= now]:
+            self.discard(key)
+        # Still full: drop the oldest insertions
+        while len(self._entries) >= self.max_entries:
+            self.discard(next(iter(self._entries)))
+
+
+_session_cache = _SessionCache(SESSION_CACHE_TTL, SESSION_CACHE_MAX_ENTRIES)
+
+
+# Newest pending profile write per user; also keeps the tasks referenced
+_profile_writes: dict[str, asyncio.Task] = {}
+
+
+def _spawn_profile_write(method: str, *, user_id: str, **kwargs) -> None:
+    """Run a user_memory profile write in a thread without awaiting it.
+
+    Writes for one user run in order, so an update never lands before the
+    profile file is created. Failures are logged; they never fail the request.
+    """
+    kwargs["user_id"] = user_id
+    previous = _profile_writes.get(user_id)
+
+    async def write() -> None:
+        if previous is not None:
+            await asyncio.wait([previous])
+        await asyncio.to_thread(lambda: getattr(get_user_memory_service(), method)(**kwargs))
+
+    task = asyncio.create_task(write())
+    _profile_writes[user_id] = task
+    task.add_done_callback(functools.partial(_profile_write_done, user_id))
+
+
+def _profile_write_done(user_id: str, task: asyncio.Task) -> None:
+    if _profile_writes.get(user_id) is task:
+        del _profile_writes[user_id]
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("User profile write failed for %s", user_id, exc_info=task.exception())
+
+
+# Statements built once and executed with bound values, so requests skip
+# rebuilding the expression tree and SQLAlchemy can reuse its cache key.
+_SELECT_USER_BY_LOGIN = select(User).where(User.login == bindparam("login"))
+_SELECT_USER_BY_ID = select(User).where(User.id == bindparam("user_id"))
+# The user joined to its live session (token_hash is indexed)
+_SELECT_SESSION_USER = (
+    select(User, AuthSession.expires_at)
+    .join(AuthSession, AuthSession.user_id == User.id)
+    .where(AuthSession.token_hash == bindparam("token_hash"))
+    .where(AuthSession.expires_at > bindparam("now"))
+)
+_DELETE_SESSION = (
+    delete(AuthSession)
+    .where(AuthSession.token_hash == bindparam("token_hash"))
+    .execution_options(synchronize_session=False)
+)
+
+
 class AuthService:
     """Service for user authentication and session management."""
 
+    __slots__ = ("session",)
+
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
@@ -67,43 +265,38 @@ class AuthService:
         Raises:
             UserExistsError: If login is already taken
         """
-        # Check if user exists
-        existing = await self.session.execute(
-            select(User).where(User.login == login)
-        )
-        if existing.scalar_one_or_none():
-            raise UserExistsError(f"User '{login}' already exists")
-
-        # Hash password
-        password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-
-        # Create user
-        user = User(
-            id=str(uuid.uuid4()),
-            login=login,
-            password_hash=password_hash,
-            display_name=display_name,
-            about=about,
-        )
-        self.session.add(user)
+        user = await self._add_user(login, password, display_name, about)
         await self.session.commit()
-        await self.session.refresh(user)
-        
-        # Create user.md profile file
-        try:
-            user_memory = get_user_memory_service()
-            user_memory.create_user_profile(
-                user_id=user.id,
-                login=login,
-                display_name=display_name,
-                about=about,
-            )
-        except Exception:
-            # Don't fail registration if file creation fails
-            pass
-        
+        self._create_profile(user)
         return user
 
+    async def register_and_login(
+        self,
+        login: str,
+        password: str,
+        display_name: str,
+        about: str | None = None,
+    ) -> tuple[User, str]:
+        """Register a new user and open a session for them in one commit.
+        
+        Args:
+            login: Unique username
+            password: Plain text password (will be hashed)
+            display_name: How to address the user
+            about: Free-form description
+            
+        Returns:
+            Tuple of (User, session_token)
+            
+        Raises:
+            UserExistsError: If login is already taken
+        """
+        user = await self._add_user(login, password, display_name, about)
+        token = self._add_auth_session(user)
+        await self.session.commit()
+        self._create_profile(user)
+        return user, token
+
     async def login(self, login: str, password: str) -> tuple[User, str]:
         """Authenticate user and create session.
         
@@ -118,26 +311,18 @@ class AuthService:
             InvalidCredentialsError: If login/password is incorrect
         """
         # Find user
-        result = await self.session.execute(
-            select(User).where(User.login == login)
-        )
+        result = await self.session.execute(_SELECT_USER_BY_LOGIN, {"login": login})
         user = result.scalar_one_or_none()
-        
-        if not user or not bcrypt.checkpw(password.encode('utf-8'), user.password_hash.encode('utf-8')):
-            raise InvalidCredentialsError("Invalid login or password")
 
-        # Generate session token
-        token = secrets.token_urlsafe(32)
-        token_hash = self._hash_token(token)
+        if user is None:
+            # Spend the same bcrypt time as a wrong password so response
+            # timing does not reveal whether the login exists.
+            await _check_password(password, await asyncio.to_thread(_dummy_password_hash))
+            raise InvalidCredentialsError("Invalid login or password")
+        if not await _check_password(password, user.password_hash):
+            raise InvalidCredentialsError("Invalid login or password")
 
-        # Create auth session
-        auth_session = AuthSession(
-            id=str(uuid.uuid4()),
-            user_id=user.id,
-            token_hash=token_hash,
-            expires_at=datetime.utcnow() + timedelta(days=SESSION_EXPIRATION_DAYS),
-        )
-        self.session.add(auth_session)
+        token = self._add_auth_session(user)
         await self.session.commit()
 
         return user, token
@@ -148,11 +333,11 @@ class AuthService:
         Args:
             token: Session token to invalidate
         """
-        token_hash = self._hash_token(token)
-        await self.session.execute(
-            delete(AuthSession).where(AuthSession.token_hash == token_hash)
-        )
+        result = await self.session.execute(_DELETE_SESSION, {"token_hash": self._hash_token(token)})
+        if result.rowcount == 0:
+            await self.session.execute(_DELETE_SESSION, {"token_hash": self._legacy_hash_token(token)})
         await self.session.commit()
+        _session_cache.discard(self._token_digest(token))
 
     async def validate_session(self, token: str) -> User | None:
         """Validate session token and return user.
@@ -163,23 +348,28 @@ class AuthService:
         Returns:
             User if valid, None otherwise
         """
-        token_hash = self._hash_token(token)
-        
-        result = await self.session.execute(
-            select(AuthSession)
-            .where(AuthSession.token_hash == token_hash)
-            .where(AuthSession.expires_at > datetime.utcnow())
-        )
-        auth_session = result.scalar_one_or_none()
-        
-        if not auth_session:
+        key = self._token_digest(token)
+        cached = _session_cache.get(key)
+        if cached is not None:
+            return cached
+
+        # One round trip for the user and its session expiry
+        now = _now()
+        result = await self.session.execute(_SELECT_SESSION_USER, {"token_hash": key.hex(), "now": now})
+        row = result.one_or_none()
+        if row is None:
+            # Sessions issued before keyed digests still carry SHA-256 hashes
+            result = await self.session.execute(
+                _SELECT_SESSION_USER, {"token_hash": self._legacy_hash_token(token), "now": now}
+            )
+            row = result.one_or_none()
+
+        if row is None:
             return None
 
-        # Get user
-        result = await self.session.execute(
-            select(User).where(User.id == auth_session.user_id)
-        )
-        return result.scalar_one_or_none()
+        user, expires_at = row
+        _session_cache.put(key, user, expires_at)
+        return user
 
     async def change_password(self, user_id: str, new_password: str) -> None:
         """Change user password.
@@ -188,15 +378,14 @@ class AuthService:
             user_id: User ID
             new_password: New plain text password
         """
-        result = await self.session.execute(
-            select(User).where(User.id == user_id)
-        )
+        result = await self.session.execute(_SELECT_USER_BY_ID, {"user_id": user_id})
         user = result.scalar_one_or_none()
         
         if user:
-            user.password_hash = bcrypt.hashpw(new_password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-            user.updated_at = datetime.utcnow()
+            user.password_hash = await _hash_password(new_password)
+            user.updated_at = _now()
             await self.session.commit()
+            _session_cache.discard_user(user_id)
 
     async def get_user(self, user_id: str) -> User | None:
         """Get user by ID.
@@ -207,9 +396,7 @@ class AuthService:
         Returns:
             User or None
         """
-        result = await self.session.execute(
-            select(User).where(User.id == user_id)
-        )
+        result = await self.session.execute(_SELECT_USER_BY_ID, {"user_id": user_id})
         return result.scalar_one_or_none()
 
     async def update_user(
@@ -228,9 +415,7 @@ class AuthService:
         Returns:
             Updated user or None if not found
         """
-        result = await self.session.execute(
-            select(User).where(User.id == user_id)
-        )
+        result = await self.session.execute(_SELECT_USER_BY_ID, {"user_id": user_id})
         user = result.scalar_one_or_none()
         
         if user:
@@ -238,41 +423,140 @@ class AuthService:
                 user.display_name = display_name
             if about is not None:
                 user.about = about
-            user.updated_at = datetime.utcnow()
+            user.updated_at = _now()
             await self.session.commit()
-            await self.session.refresh(user)
+            # Cached users carry the old profile
+            _session_cache.discard_user(user_id)
             
             # Update user.md profile file
-            try:
-                user_memory = get_user_memory_service()
-                user_memory.update_user_profile(
-                    user_id=user.id,
-                    display_name=display_name,
-                    about=about,
-                )
-            except Exception:
-                # Don't fail update if file update fails
-                pass
+            _spawn_profile_write("update_user_profile", user_id=user.id, display_name=display_name, about=about)
             
         return user
 
-    async def cleanup_expired_sessions(self) -> int:
+    async def cleanup_expired_sessions(self, batch_size: int = CLEANUP_BATCH_SIZE) -> int:
         """Remove expired auth sessions.
         
+        Deletes in batches of ``batch_size`` rows, committing after each,
+        so no single statement holds row locks for long.
+        
+        Args:
+            batch_size: Maximum rows removed per DELETE
+            
         Returns:
             Number of sessions removed
         """
-        result = await self.session.execute(
-            delete(AuthSession).where(AuthSession.expires_at < datetime.utcnow())
+        now = _now()
+        expired_ids = (
+            select(AuthSession.id)
+            .where(AuthSession.expires_at < now)
+            .limit(batch_size)
+            .scalar_subquery()
         )
-        await self.session.commit()
-        return result.rowcount
+        stmt = (
+            delete(AuthSession)
+            .where(AuthSession.id.in_(expired_ids))
+            .execution_options(synchronize_session=False)
+        )
+        removed = 0
+        while True:
+            result = await self.session.execute(stmt)
+            await self.session.commit()
+            removed += result.rowcount
+            if result.rowcount < batch_size:
+                return removed
+
+    async def _add_user(
+        self,
+        login: str,
+        password: str,
+        display_name: str,
+        about: str | None,
+    ) -> User:
+        """Add a new user to the session without committing."""
+        # Check if user exists
+        existing = await self.session.execute(_SELECT_USER_BY_LOGIN, {"login": login})
+        if existing.scalar_one_or_none():
+            raise UserExistsError(f"User '{login}' already exists")
+
+        user = User(
+            login=login,
+            password_hash=await _hash_password(password),
+            display_name=display_name,
+            about=about,
+        )
+        self.session.add(user)
+        # Assigns the id (needed for the auth session) and timestamp defaults
+        await self.session.flush()
+        return user
+
+    def _add_auth_session(self, user: User) -> str:
+        """Add a new auth session for ``user`` without committing; return its token."""
+        token = secrets.token_urlsafe(32)
+        self.session.add(
+            AuthSession(
+                user_id=user.id,
+                token_hash=self._hash_token(token),
+                expires_at=_now() + timedelta(days=SESSION_EXPIRATION_DAYS),
+            )
+        )
+        return token
+
+    @staticmethod
+    def _create_profile(user: User) -> None:
+        """Create the user's user.md profile file in the background."""
+        _spawn_profile_write(
+            "create_user_profile",
+            user_id=user.id,
+            login=user.login,
+            display_name=user.display_name,
+            about=user.about,
+        )
+
+    @staticmethod
+    def _token_digest(token: str) -> bytes:
+        """Keyed BLAKE2b digest of a session token."""
+        return hashlib.blake2b(token.encode(), digest_size=32, key=_TOKEN_HASH_KEY).digest()
+
+    @classmethod
+    def _hash_token(cls, token: str) -> str:
+        """Hash token for storage (keyed BLAKE2b).
+
+        Invariant: in-process token lookups (the session cache, the auth
+        middleware cache) key on ``_token_digest`` too, never the raw token.
+        Without the key an attacker cannot choose which digest bytes match, so
+        the timing of a dict probe says nothing about valid tokens. Any direct
+        comparison of digests outside a dict must use secrets.compare_digest.
+        """
+        return cls._token_digest(token).hex()
 
     @staticmethod
-    def _hash_token(token: str) -> str:
-        """Hash token for storage."""
+    def _legacy_hash_token(token: str) -> str:
+        """SHA-256 hash stored for sessions issued before keyed digests.
+
+        Only looked up when the keyed digest misses; can be dropped once those
+        sessions have expired (SESSION_EXPIRATION_DAYS).
+        """
         return hashlib.sha256(token.encode()).hexdigest()
 
+async def run_session_cleanup(
+    session_factory: Callable[[], AsyncSession],
+    interval: float = SESSION_CLEANUP_INTERVAL,
+) -> None:
+    """Remove expired auth sessions every ``interval`` seconds until cancelled.
+
+    Meant to run as a background task of the app. A failed run is logged and
+    retried on the next tick.
+    """
+    while True:
+        try:
+            async with session_factory() as session:
+                removed = await AuthService(session).cleanup_expired_sessions()
+            if removed:
+                logger.info("Removed %d expired auth sessions", removed)
+        except Exception:
+            logger.exception("Expired auth session cleanup failed")
+        await asyncio.sleep(interval)
+
 
 __all__ = [
     "AuthService",
@@ -280,4 +564,5 @@ __all__ = [
     "InvalidCredentialsError",
     "UserExistsError",
     "SessionExpiredError",
+    "run_session_cleanup",
 ]
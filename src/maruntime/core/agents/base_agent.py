@@ -1,7 +1,12 @@
 from __future__ import annotations
 
 import abc
+import asyncio
+import contextlib
+import itertools
+import logging
 import uuid
+from datetime import UTC, datetime
 from typing import Any, AsyncGenerator, ClassVar, Iterable, List, Sequence, Type
 
 from maruntime.core.llm import LLMClientFactory, content_to_text
@@ -15,9 +20,24 @@ from maruntime.runtime.templates import LLMPolicy, TemplateRuntimeConfig, ToolPo
 from maruntime.security import RulePhase, RulesEngine
 
 
+# Agents are built per request; a shared factory lets them reuse its cached
+# AsyncOpenAI clients and their connection pools across runs.
+_SHARED_LLM_CLIENT_FACTORY = LLMClientFactory()
+
+# Agent step events are written by a background task in batches of up to
+# AGENT_STEP_BATCH_SIZE rows, or whatever arrived within AGENT_STEP_FLUSH_INTERVAL
+# seconds of the first one, so the ReAct loop never waits on the database.
+AGENT_STEP_BATCH_SIZE = 32
+AGENT_STEP_FLUSH_INTERVAL = 0.05
+
+logger = logging.getLogger(__name__)
+
+
 class AgentRegistryMixin:
     """Mixin that auto-registers agent classes in the global registry."""
 
+    __slots__ = ()
+
     agent_registry: ClassVar[AgentRegistry] = AgentRegistry
 
     def __init_subclass__(cls, **kwargs: Any) -> None:  # noqa: D401
@@ -36,6 +56,32 @@ class BaseAgent(AgentRegistryMixin, abc.ABC):
 
     name: ClassVar[str] = "base_agent"
 
+    # Many agents are alive at once under load; slots keep instances compact.
+    # Subclasses that declare no __slots__ of their own simply get a __dict__.
+    __slots__ = (
+        "id",
+        "task",
+        "toolkit",
+        "prompts_config",
+        "streaming_generator",
+        "session_service",
+        "session_context",
+        "message_store",
+        "template_version_id",
+        "tool_policy",
+        "tool_search_service",
+        "template_config",
+        "rules_engine",
+        "_llm_client_factory",
+        "_prompt_tool_names",
+        "_context_data",
+        "_stage",
+        "_user_id",
+        "_agent_step_queue",
+        "_agent_step_writer",
+        "_agent_step_error",
+    )
+
     def __init__(
         self,
         task: str,
@@ -73,13 +119,16 @@ class BaseAgent(AgentRegistryMixin, abc.ABC):
         self.tool_search_service = tool_search_service
         self.template_config = template_config
         self.rules_engine = rules_engine or RulesEngine()
-        self._llm_client_factory = llm_client_factory or LLMClientFactory()
+        self._llm_client_factory = llm_client_factory or _SHARED_LLM_CLIENT_FACTORY
         self._prompt_tool_names: list[str] | None = None
         self._context_data: dict[str, Any] = (
             dict(context_data) if context_data is not None else dict(getattr(session_context, "data", {}) or {})
         )
         self._stage: str | None = None
         self._user_id: str | None = user_id
+        self._agent_step_queue: asyncio.Queue[tuple[str, dict[str, Any]]] | None = None
+        self._agent_step_writer: asyncio.Task[None] | None = None
+        self._agent_step_error: Exception | None = None
 
     @property
     def available_tools(self) -> Sequence[str]:
@@ -311,15 +360,79 @@ class BaseAgent(AgentRegistryMixin, abc.ABC):
         step_number: int,
         step_data: dict[str, Any],
     ) -> None:
-        """Record an agent step event to the database."""
-        await self._ensure_session_state()
+        """Queue an agent step event for the background writer.
+
+        The row is timestamped here so history keeps event order even though it
+        reaches the database later; ``_flush_agent_steps`` waits for the writes.
+        """
+        # run() has already set the session up; only a step recorded outside
+        # it needs the lookup, so the ReAct loop never waits on the database.
+        if self.session_context is None:
+            await self._ensure_session_state()
         if self.session_service and self.session_context:
-            await self.session_service.save_agent_step(
-                session_id=self.session_context.session_id,
-                message_type=message_type,
-                step_number=step_number,
-                step_data=step_data,
-            )
+            if self._agent_step_writer is None:
+                self._agent_step_queue = asyncio.Queue()
+                self._agent_step_writer = asyncio.create_task(self._write_agent_steps())
+            self._agent_step_queue.put_nowait((
+                self.session_context.session_id,
+                {
+                    "message_type": message_type,
+                    "step_number": step_number,
+                    "step_data": step_data,
+                    "created_at": datetime.now(UTC),
+                },
+            ))
+
+    async def _write_agent_steps(self) -> None:
+        queue = self._agent_step_queue
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + AGENT_STEP_FLUSH_INTERVAL
+            while len(batch) < AGENT_STEP_BATCH_SIZE:
+                if not queue.empty():
+                    batch.append(queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                for session_id, items in itertools.groupby(batch, key=lambda item: item[0]):
+                    await self.session_service.save_agent_steps(session_id, [step for _, step in items])
+            except Exception as exc:
+                logger.exception("Failed to save %d agent steps", len(batch))
+                self._agent_step_error = self._agent_step_error or exc
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _flush_agent_steps(self) -> None:
+        """Wait for queued agent steps to be written and stop the writer.
+
+        Re-raises the first write error so a run does not complete silently
+        without its step history.
+        """
+        if self._agent_step_writer is None:
+            return
+        try:
+            await self._agent_step_queue.join()
+        finally:
+            # Also reached when the caller is cancelled mid-wait, so the
+            # writer never outlives the run.
+            self._stop_agent_step_writer()
+        error, self._agent_step_error = self._agent_step_error, None
+        if error is not None:
+            raise error
+
+    def _stop_agent_step_writer(self) -> None:
+        if self._agent_step_writer is not None:
+            self._agent_step_writer.cancel()
+        self._agent_step_writer = None
+        self._agent_step_queue = None
 
     def reset(self) -> None:
         """Clear session-scoped state so the agent can handle a new session."""
@@ -328,6 +441,8 @@ class BaseAgent(AgentRegistryMixin, abc.ABC):
         self.message_store = None
         self._context_data = {}
         self._prompt_tool_names = None
+        self._stop_agent_step_writer()
+        self._agent_step_error = None
 
     async def execute(self, *, session_id: str | None = None) -> AsyncGenerator[SSEEvent, None]:
         """Run the agent workflow with persistence-aware state handling.
@@ -349,9 +464,11 @@ class BaseAgent(AgentRegistryMixin, abc.ABC):
         try:
             async for event in self.run():
                 yield event
+            await self._flush_agent_steps()
             if self.session_service:
                 await self.session_service.set_state(self.session_context.session_id, "COMPLETED")
         except WaitingForClarification:
+            await self._flush_agent_steps()
             if self.session_service:
                 await self.session_service.set_state(self.session_context.session_id, "WAITING")
             return
@@ -359,6 +476,10 @@ class BaseAgent(AgentRegistryMixin, abc.ABC):
             if self.session_service and self.session_context:
                 await self.session_service.set_state(self.session_context.session_id, "FAILED")
             raise
+        finally:
+            # Failed or abandoned runs still keep the steps queued so far.
+            with contextlib.suppress(Exception):
+                await self._flush_agent_steps()
 
     async def resume(self, session_id: str) -> AsyncGenerator[SSEEvent, None]:
         """Resume execution for an existing session."""
@@ -10,16 +10,21 @@ This agent excludes FinalAnswerTool and generates free-form answers instead.
 
 from __future__ import annotations
 
+import asyncio
+import atexit
+import collections
+import functools
 import json
 import logging
+import queue
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Any, AsyncGenerator, Type
+from typing import Any, AsyncGenerator, Callable, Type
 
 from openai import AsyncOpenAI
 
 from maruntime.core.agents.base_agent import BaseAgent
-from maruntime.core.llm import LLMClientFactory
 from maruntime.core.models import AgentContext, AgentStatesEnum
 from maruntime.core.streaming.openai_sse import SSEEvent
 from maruntime.core.tools.base_tool import BaseTool, PydanticTool
@@ -29,8 +34,36 @@ from maruntime.runtime import ChatMessage
 LOGS_DIR = Path("./logs")
 
 
+_LOG_FORMATTER = logging.Formatter(
+    "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S"
+)
+
+# Session loggers only enqueue records; one background thread writes them,
+# so file and console I/O never blocks the event loop.
+_log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+_log_listener: QueueListener | None = None
+
+
+class _SessionLogRouter(logging.Handler):
+    """Hand each queued record to the file handler of its session logger."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.file_handlers: dict[str, logging.Handler] = {}
+
+    def emit(self, record: logging.LogRecord) -> None:
+        handler = self.file_handlers.get(record.name)
+        if handler is not None and record.levelno >= handler.level:
+            handler.handle(record)
+
+
+_log_router = _SessionLogRouter()
+
+
 def setup_session_logger(agent_name: str, session_id: str) -> logging.Logger:
     """Create a logger that writes to a session-specific file."""
+    global _log_listener
     LOGS_DIR.mkdir(parents=True, exist_ok=True)
     
     logger_name = f"maruntime.agent.{agent_name}.{session_id}"
@@ -42,33 +75,57 @@ def setup_session_logger(agent_name: str, session_id: str) -> logging.Logger:
     
     timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
     log_filename = LOGS_DIR / f"{timestamp}-{agent_name}-{session_id[:8]}.log"
-    file_handler = logging.FileHandler(log_filename, encoding="utf-8")
+    # delay=True: the file is opened by the listener thread on first write
+    file_handler = logging.FileHandler(log_filename, encoding="utf-8", delay=True)
     file_handler.setLevel(logging.DEBUG)
-    
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    
-    formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S"
-    )
-    file_handler.setFormatter(formatter)
-    console_handler.setFormatter(formatter)
-    
-    session_logger.addHandler(file_handler)
-    session_logger.addHandler(console_handler)
+    file_handler.setFormatter(_LOG_FORMATTER)
+    _log_router.file_handlers[logger_name] = file_handler
+
+    if _log_listener is None:
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(logging.INFO)
+        console_handler.setFormatter(_LOG_FORMATTER)
+        _log_listener = QueueListener(_log_queue, _log_router, console_handler, respect_handler_level=True)
+        _log_listener.start()
+        # Drain what is still queued on interpreter exit
+        atexit.register(_log_listener.stop)
+
+    session_logger.addHandler(QueueHandler(_log_queue))
     
     return session_logger
 
 
 logger = logging.getLogger(__name__)
 
+
+class _LazyStr:
+    """Log argument whose value is computed only when the record is formatted."""
+
+    __slots__ = ("_compute",)
+
+    def __init__(self, compute: Callable[[], Any]) -> None:
+        self._compute = compute
+
+    def __str__(self) -> str:
+        return str(self._compute())
+
+
 # Tools that indicate reasoning is complete
 REASONING_TOOLS = {"reasoningtool", "reasoning_tool", "reasoning"}
 
 # Tools to EXCLUDE from schema (we use free-form answer instead)
 FINAL_ANSWER_TOOLS = {"finalanswertool", "final_answer", "finalanswer"}
 
+# Rough ratio used to budget the conversation without a tokenizer
+CHARS_PER_TOKEN = 4
+
+# Tool executions kept in the in-memory diagnostic log
+EXECUTION_LOG_SIZE = 100
+
+# Tools that change the agent state or can end the turn; they never run
+# concurrently with other tool calls
+SEQUENTIAL_TOOLS = REASONING_TOOLS | FINAL_ANSWER_TOOLS | {"clarificationtool", "clarification_tool"}
+
 
 class FlexibleToolCallingAgent(BaseAgent):
     """Agent with ReAct loop that uses free-form final answers instead of FinalAnswerTool.
@@ -89,36 +146,64 @@ class FlexibleToolCallingAgent(BaseAgent):
 
     name = "flexible_tool_calling_agent"
 
+    __slots__ = (
+        "max_iterations",
+        "conversation_budget_tokens",
+        "max_tool_result_chars",
+        "_iteration",
+        "_finished",
+        "_client",
+        "_conversation",
+        "_agent_context",
+        "_log",
+        "_session_logger",
+        "_collected_reasoning",
+        "_tool_index",
+    )
+
     def __init__(
         self,
         task: str,
         toolkit: list[Type[BaseTool]] | None = None,
         max_iterations: int = 10,
+        conversation_budget_tokens: int = 32_000,
+        max_tool_result_chars: int = 20_000,
         **kwargs: Any,
     ) -> None:
         super().__init__(task=task, toolkit=toolkit or [], **kwargs)
         self.max_iterations = max_iterations
+        # Approximate size of the conversation sent with each LLM call
+        self.conversation_budget_tokens = conversation_budget_tokens
+        # Longest tool result the LLM sees; events and logs keep the full text
+        self.max_tool_result_chars = max_tool_result_chars
         self._iteration = 0
         self._finished = False
         self._client: AsyncOpenAI | None = None
         self._conversation: list[dict[str, Any]] = []
         self._agent_context = AgentContext()
-        self._log: list[dict[str, Any]] = []
+        # Recent tool executions for diagnostics; long runs drop the oldest
+        self._log: collections.deque[dict[str, Any]] = collections.deque(maxlen=EXECUTION_LOG_SIZE)
         self._session_logger: logging.Logger | None = None
         # Collected reasoning for free-form answer generation
         self._collected_reasoning: list[str] = []
+        # Lower-cased tool name -> class; the first tool with a name wins
+        self._tool_index: dict[str, Type[BaseTool]] = {}
+        for tool_cls in self.toolkit:
+            name = getattr(tool_cls, "tool_name", None) or tool_cls.__name__
+            self._tool_index.setdefault(name.lower(), tool_cls)
 
     def _get_logger(self) -> logging.Logger:
         """Get session logger or fallback to module logger."""
         return self._session_logger or logger
 
     # ==================== Logging Methods ====================
+    # Messages use %-style arguments so logging formats them only for records
+    # a handler will emit; costly arguments are wrapped in _LazyStr.
 
     def _log_step_start(self) -> None:
         self._get_logger().info(
-            f"\n{'='*50}\n"
-            f"📍 Step {self._iteration}/{self.max_iterations} started\n"
-            f"{'='*50}"
+            "\n%s\n📍 Step %d/%d started\n%s",
+            "=" * 50, self._iteration, self.max_iterations, "=" * 50,
         )
 
     def _log_tool_execution(self, tool_name: str, tool_args: dict, result: str) -> None:
@@ -126,12 +211,15 @@ class FlexibleToolCallingAgent(BaseAgent):
             self._log_reasoning_result(tool_args)
         else:
             self._get_logger().info(
-                f"\n###############################################\n"
-                f"🛠️ TOOL EXECUTION:\n"
-                f"    🔧 Tool: {tool_name}\n"
-                f"    📋 Args: {json.dumps(tool_args, indent=2, ensure_ascii=False)[:500]}\n"
-                f"    🔍 Result: '{result[:400]}...'\n"
-                f"###############################################"
+                "\n###############################################\n"
+                "🛠️ TOOL EXECUTION:\n"
+                "    🔧 Tool: %s\n"
+                "    📋 Args: %s\n"
+                "    🔍 Result: '%s...'\n"
+                "###############################################",
+                tool_name,
+                _LazyStr(lambda: json.dumps(tool_args, indent=2, ensure_ascii=False)[:500]),
+                result[:400],
             )
         self._log.append({
             "step": self._iteration,
@@ -141,39 +229,42 @@ class FlexibleToolCallingAgent(BaseAgent):
         })
 
     def _log_reasoning_result(self, tool_args: dict) -> None:
-        reasoning_steps = tool_args.get("reasoning_steps", [])
-        task_completed = tool_args.get("task_completed", False)
-        enough_data = tool_args.get("enough_data", False)
-        
         self._get_logger().info(
-            f"\n###############################################\n"
-            f"🤖 REASONING:\n"
-            f"   🧠 Steps: {reasoning_steps}\n"
-            f"   ✅ Enough Data: {enough_data}\n"
-            f"   🏁 Task Completed: {task_completed}\n"
-            f"###############################################"
+            "\n###############################################\n"
+            "🤖 REASONING:\n"
+            "   🧠 Steps: %s\n"
+            "   ✅ Enough Data: %s\n"
+            "   🏁 Task Completed: %s\n"
+            "###############################################",
+            tool_args.get("reasoning_steps", []),
+            tool_args.get("enough_data", False),
+            tool_args.get("task_completed", False),
         )
 
     def _log_agent_start(self) -> None:
-        tool_names = [getattr(t, "tool_name", None) or t.__name__ for t in self.toolkit]
         self._get_logger().info(
-            f"\n{'#'*60}\n"
-            f"🚀 FLEXIBLE AGENT STARTING\n"
-            f"    📝 Task: '{self.task[:200]}...'\n"
-            f"    🛠️ Tools: {tool_names}\n"
-            f"    ⚙️ Max Iterations: {self.max_iterations}\n"
-            f"    🎯 Mode: Free-form final answer\n"
-            f"{'#'*60}"
+            "\n%s\n"
+            "🚀 FLEXIBLE AGENT STARTING\n"
+            "    📝 Task: '%s...'\n"
+            "    🛠️ Tools: %s\n"
+            "    ⚙️ Max Iterations: %d\n"
+            "    🎯 Mode: Free-form final answer\n"
+            "%s",
+            "#" * 60,
+            self.task[:200],
+            _LazyStr(lambda: [getattr(t, "tool_name", None) or t.__name__ for t in self.toolkit]),
+            self.max_iterations,
+            "#" * 60,
         )
 
     def _log_agent_finish(self, success: bool, result: str | None) -> None:
-        status = "✅ COMPLETED" if success else "❌ FAILED"
         self._get_logger().info(
-            f"\n{'#'*60}\n"
-            f"{status}\n"
-            f"    📍 Total Steps: {self._iteration}\n"
-            f"    📄 Result: '{(result or 'None')[:200]}...'\n"
-            f"{'#'*60}"
+            "\n%s\n%s\n    📍 Total Steps: %d\n    📄 Result: '%s...'\n%s",
+            "#" * 60,
+            "✅ COMPLETED" if success else "❌ FAILED",
+            self._iteration,
+            (result or "None")[:200],
+            "#" * 60,
         )
 
     # ==================== Main Run Method ====================
@@ -185,8 +276,7 @@ class FlexibleToolCallingAgent(BaseAgent):
 
         # Initialize LLM client
         if self.template_config and self.template_config.llm_policy:
-            factory = LLMClientFactory()
-            self._client = factory.for_policy(self.template_config.llm_policy)
+            self._client = self._llm_client_factory.for_policy(self.template_config.llm_policy)
         else:
             self._get_logger().error("No LLM policy configured!")
             yield self.streaming_generator.error(0, "No LLM configuration")
@@ -201,6 +291,8 @@ class FlexibleToolCallingAgent(BaseAgent):
 
         clarification_pending = bool(self._context_data.get("clarification_requested"))
         waiting_for_clarification = False
+        # Set once the answer's message events went out while it was generated
+        answer_streamed = False
 
         # Build initial conversation
         system_prompt = self._system_prompt()
@@ -212,21 +304,26 @@ class FlexibleToolCallingAgent(BaseAgent):
         self._conversation.append({"role": "user", "content": user_prompt})
         # Save original task to DB (without formatting), not the templated version
         await self._record_message(ChatMessage.text("user", self.task))
-        self._get_logger().info(f"📥 User request: '{self.task[:200]}...'")
+        self._get_logger().info("📥 User request: '%s...'", self.task[:200])
 
         # Build tools schema (WITHOUT FinalAnswerTool!)
         tools_schema = self._build_tools_schema()
         if not tools_schema:
             # No tools - generate direct answer
             yield self.streaming_generator.step_start(1, self.max_iterations, "Generating response...")
-            final_result = await self._generate_free_form_answer()
+            parts: list[str] = []
+            async for event in self._free_form_answer_events(parts):
+                yield event
+            final_result = "".join(parts)
+            answer_streamed = bool(final_result) and self.template_config.llm_policy.streaming
             yield self.streaming_generator.step_end(1, "completed")
             self._finished = True
         else:
-            self._get_logger().info(f"🛠️ Tools: {[t['function']['name'] for t in tools_schema]}")
+            self._get_logger().info(
+                "🛠️ Tools: %s", _LazyStr(lambda: [t["function"]["name"] for t in tools_schema])
+            )
 
             # ReAct loop
-            all_content: list[str] = []
             final_result: str | None = None
             ready_for_final_answer = False
             
@@ -244,6 +341,7 @@ class FlexibleToolCallingAgent(BaseAgent):
                 })
 
                 try:
+                    self._trim_conversation()
                     response = await self._client.chat.completions.create(
                         model=self.template_config.llm_policy.model,
                         messages=self._conversation,
@@ -256,84 +354,88 @@ class FlexibleToolCallingAgent(BaseAgent):
                     assistant_message = response.choices[0].message
 
                     if assistant_message.tool_calls:
-                        for tool_call in assistant_message.tool_calls:
-                            tool_name = tool_call.function.name
-                            tool_args_str = tool_call.function.arguments
-
-                            try:
-                                tool_args = json.loads(tool_args_str) if tool_args_str else {}
-                            except json.JSONDecodeError:
-                                tool_args = {"raw": tool_args_str}
-
-                            yield self.streaming_generator.tool_call(
-                                self._iteration, tool_name, tool_args
-                            )
-                            await self._record_agent_step("tool_call", self._iteration, {
-                                "tool_name": tool_name,
-                                "tool_args": tool_args,
-                            })
-
-                            # Execute tool
-                            result = await self._execute_tool(tool_name, tool_args_str)
-                            self._log_tool_execution(tool_name, tool_args, result)
-                            
-                            yield self.streaming_generator.tool_result(
-                                self._iteration, tool_name, result, 
-                                success=not result.startswith("Error")
-                            )
-                            await self._record_agent_step("tool_result", self._iteration, {
-                                "tool_name": tool_name,
-                                "result": result[:2000],  # Truncate for DB
-                                "success": not result.startswith("Error"),
-                            })
-
-                            all_content.append(f"\n🔧 {tool_name}: {result[:200]}...")
-
-                            # Add to conversation
-                            self._conversation.append({
-                                "role": "assistant",
-                                "content": None,
-                                "tool_calls": [{
-                                    "id": tool_call.id,
-                                    "type": "function",
-                                    "function": {
-                                        "name": tool_name,
-                                        "arguments": tool_args_str,
-                                    }
-                                }]
-                            })
-                            self._conversation.append({
-                                "role": "tool",
-                                "tool_call_id": tool_call.id,
-                                "content": result,
-                            })
-
-                            if self._agent_context.state == AgentStatesEnum.WAITING_FOR_CLARIFICATION:
-                                self._context_data["clarification_requested"] = True
-                                await self._persist_context()
-                                final_result = result
-                                waiting_for_clarification = True
-                                self._finished = True
-                                break
+                        for batch in self._tool_call_batches(assistant_message.tool_calls):
+                            for tool_call, tool_args, _ in batch:
+                                tool_name = tool_call.function.name
+                                yield self.streaming_generator.tool_call(
+                                    self._iteration, tool_name, tool_args
+                                )
+                                await self._record_agent_step("tool_call", self._iteration, {
+                                    "tool_name": tool_name,
+                                    "tool_args": tool_args,
+                                })
+
+                            # Execute the batch concurrently; results are handled
+                            # in the order the model issued the calls
+                            results = await asyncio.gather(*(
+                                self._execute_tool(tool_call.function.name, tool_args, args_error)
+                                for tool_call, tool_args, args_error in batch
+                            ))
+
+                            for (tool_call, tool_args, _), result in zip(batch, results):
+                                tool_name = tool_call.function.name
+                                tool_args_str = tool_call.function.arguments
+                                self._log_tool_execution(tool_name, tool_args, result)
+
+                                yield self.streaming_generator.tool_result(
+                                    self._iteration, tool_name, result, 
+                                    success=not result.startswith("Error")
+                                )
+                                await self._record_agent_step("tool_result", self._iteration, {
+                                    "tool_name": tool_name,
+                                    "result": result[:2000],  # Truncate for DB
+                                    "success": not result.startswith("Error"),
+                                })
+
+                                # Add to conversation
+                                self._conversation.append({
+                                    "role": "assistant",
+                                    "content": None,
+                                    "tool_calls": [{
+                                        "id": tool_call.id,
+                                        "type": "function",
+                                        "function": {
+                                            "name": tool_name,
+                                            "arguments": tool_args_str,
+                                        }
+                                    }]
+                                })
+                                self._conversation.append({
+                                    "role": "tool",
+                                    "tool_call_id": tool_call.id,
+                                    "content": self._cap_tool_result(result),
+                                })
+
+                                if self._agent_context.state == AgentStatesEnum.WAITING_FOR_CLARIFICATION:
+                                    self._context_data["clarification_requested"] = True
+                                    await self._persist_context()
+                                    final_result = result
+                                    waiting_for_clarification = True
+                                    self._finished = True
+                                    break
 
-                            # Check if reasoning indicates completion
-                            if tool_name.lower() in REASONING_TOOLS:
-                                self._collected_reasoning.append(result)
-                                if tool_args.get("task_completed", False) or tool_args.get("enough_data", False):
+                                # Check if reasoning indicates completion
+                                if tool_name.lower() in REASONING_TOOLS:
+                                    self._collected_reasoning.append(result)
+                                    if tool_args.get("task_completed", False) or tool_args.get("enough_data", False):
+                                        ready_for_final_answer = True
+                                        self._finished = True
+                                        break
+                                
+                                # Check agent context
+                                if self._agent_context.is_finished():
                                     ready_for_final_answer = True
                                     self._finished = True
                                     break
-                            
-                            # Check agent context
-                            if self._agent_context.is_finished():
-                                ready_for_final_answer = True
-                                self._finished = True
+
+                            # Remaining calls of this turn are skipped
+                            if self._finished:
                                 break
 
                     else:
                         # LLM responded with text (no tool call) - this IS the answer
                         if assistant_message.content:
-                            self._get_logger().info(f"💬 Text response: {assistant_message.content[:200]}...")
+                            self._get_logger().info("💬 Text response: %s...", assistant_message.content[:200])
                             self._conversation.append({
                                 "role": "assistant",
                                 "content": assistant_message.content,
@@ -354,7 +456,7 @@ class FlexibleToolCallingAgent(BaseAgent):
                     })
 
                 except Exception as e:
-                    self._get_logger().error(f"❌ Error: {e}", exc_info=True)
+                    self._get_logger().error("❌ Error: %s", e, exc_info=True)
                     yield self.streaming_generator.error(self._iteration, str(e))
                     yield self.streaming_generator.step_end(self._iteration, "error")
                     await self._record_agent_step("step_end", self._iteration, {
@@ -376,7 +478,12 @@ class FlexibleToolCallingAgent(BaseAgent):
                     "max_iterations": self.max_iterations,
                 })
                 
-                final_result = await self._generate_free_form_answer_with_reasoning()
+                self._add_reasoning_context()
+                parts = []
+                async for event in self._free_form_answer_events(parts):
+                    yield event
+                final_result = "".join(parts)
+                answer_streamed = bool(final_result) and self.template_config.llm_policy.streaming
                 
                 yield self.streaming_generator.step_end(final_step, "completed")
                 await self._record_agent_step("step_end", final_step, {
@@ -385,8 +492,12 @@ class FlexibleToolCallingAgent(BaseAgent):
 
             # Handle max iterations
             if not self._finished and self._iteration >= self.max_iterations:
-                self._get_logger().warning(f"⚠️ Max iterations reached")
-                final_result = await self._generate_free_form_answer()
+                self._get_logger().warning("⚠️ Max iterations reached")
+                parts = []
+                async for event in self._free_form_answer_events(parts):
+                    yield event
+                final_result = "".join(parts)
+                answer_streamed = bool(final_result) and self.template_config.llm_policy.streaming
                 self._agent_context.state = AgentStatesEnum.COMPLETED
 
         if clarification_pending and not waiting_for_clarification:
@@ -403,24 +514,37 @@ class FlexibleToolCallingAgent(BaseAgent):
         self._log_agent_finish(success=True, result=final_result)
         await self._record_message(ChatMessage.text("assistant", final_result))
         
-        for event in self.streaming_generator.stream_text(final_result):
-            yield event
+        if answer_streamed:
+            yield self.streaming_generator.done()
+        else:
+            for event in self.streaming_generator.stream_text(final_result):
+                yield event
 
     # ==================== Tool Schema (NO FinalAnswerTool) ====================
 
     def _build_tools_schema(self) -> list[dict[str, Any]]:
         """Build tools schema EXCLUDING FinalAnswerTool."""
-        tools = []
         skip_clarification = bool(self._context_data.get("clarification_requested"))
-        for tool_cls in self.toolkit:
+        return self._schema_for(tuple(self.toolkit), skip_clarification)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _schema_for(toolkit: tuple[Type[BaseTool], ...], skip_clarification: bool) -> list[dict[str, Any]]:
+        """Tools schema for a toolkit, built once and shared; do not mutate it.
+
+        Pydantic schema generation walks every field of every tool, and the
+        result depends only on the tool classes.
+        """
+        tools = []
+        for tool_cls in toolkit:
             name = getattr(tool_cls, "tool_name", None) or tool_cls.__name__
 
             # EXCLUDE FinalAnswerTool - we use free-form instead!
             if name.lower() in FINAL_ANSWER_TOOLS:
-                self._get_logger().debug(f"⏭️ Excluding {name} (using free-form answer)")
+                logger.debug("⏭️ Excluding %s (using free-form answer)", name)
                 continue
             if skip_clarification and name.lower() in {"clarificationtool", "clarification_tool"}:
-                self._get_logger().debug(f"⏭️ Excluding {name} (clarification already requested)")
+                logger.debug("⏭️ Excluding %s (clarification already requested)", name)
                 continue
 
             description = tool_cls.__doc__ or f"Tool: {name}"
@@ -453,8 +577,47 @@ class FlexibleToolCallingAgent(BaseAgent):
 
     # ==================== Tool Execution ====================
 
-    async def _execute_tool(self, tool_name: str, args_json: str) -> str:
-        """Execute a tool by name."""
+    @staticmethod
+    def _tool_call_batches(
+        tool_calls: list[Any],
+    ) -> list[list[tuple[Any, dict[str, Any], json.JSONDecodeError | None]]]:
+        """Split one turn's tool calls into batches that may run concurrently.
+
+        Consecutive ordinary calls share a batch. A SEQUENTIAL_TOOLS call always
+        gets its own, so state changes and early exits happen in call order.
+        Arguments are parsed here, once: each call comes with its arguments
+        and the parse error, if any (the arguments are then ``{"raw": ...}``).
+        """
+        batches: list[list[tuple[Any, dict[str, Any], json.JSONDecodeError | None]]] = []
+        joinable = False
+        for tool_call in tool_calls:
+            tool_args_str = tool_call.function.arguments
+            args_error = None
+            try:
+                tool_args = json.loads(tool_args_str) if tool_args_str else {}
+            except json.JSONDecodeError as e:
+                tool_args = {"raw": tool_args_str}
+                args_error = e
+
+            sequential = tool_call.function.name.lower() in SEQUENTIAL_TOOLS
+            if joinable and not sequential:
+                batches[-1].append((tool_call, tool_args, args_error))
+            else:
+                batches.append([(tool_call, tool_args, args_error)])
+            joinable = not sequential
+        return batches
+
+    async def _execute_tool(
+        self,
+        tool_name: str,
+        args: dict[str, Any],
+        args_error: json.JSONDecodeError | None = None,
+    ) -> str:
+        """Execute a tool by name with already parsed arguments.
+
+        ``args_error`` is the error from parsing the model's arguments; the
+        tool is then not run and the error is reported as its result.
+        """
         if tool_name.lower() in {"clarificationtool", "clarification_tool"}:
             if self._context_data.get("clarification_requested"):
                 return (
@@ -462,18 +625,13 @@ class FlexibleToolCallingAgent(BaseAgent):
                     "Proceed with other tools."
                 )
 
-        tool_cls = None
-        for tc in self.toolkit:
-            tc_name = getattr(tc, "tool_name", None) or tc.__name__
-            if tc_name.lower() == tool_name.lower():
-                tool_cls = tc
-                break
-
+        tool_cls = self._tool_index.get(tool_name.lower())
         if tool_cls is None:
             return f"Error: Tool '{tool_name}' not found"
 
         try:
-            args = json.loads(args_json) if args_json else {}
+            if args_error is not None:
+                raise args_error
 
             self._agent_context.user_id = self._user_id
             if self.session_context:
@@ -489,6 +647,8 @@ class FlexibleToolCallingAgent(BaseAgent):
                     default_max_reasoning,
                 )
                 max_reasoning_len = min(max_reasoning_len, default_max_reasoning)
+                # Copy: the caller still logs and reports the original arguments
+                args = dict(args)
                 self._trim_reasoning_arg(args, max_reasoning_len)
 
             if issubclass(tool_cls, PydanticTool):
@@ -501,24 +661,90 @@ class FlexibleToolCallingAgent(BaseAgent):
             return str(result) if result else "OK"
 
         except Exception as e:
-            self._get_logger().error(f"Tool error: {e}", exc_info=True)
+            self._get_logger().error("Tool error: %s", e, exc_info=True)
             return f"Error: {str(e)}"
 
+    # ==================== Conversation Budget ====================
+
+    def _cap_tool_result(self, result: str) -> str:
+        if len(result) <= self.max_tool_result_chars:
+            return result
+        return result[:self.max_tool_result_chars] + "\n...[truncated]"
+
+    @staticmethod
+    def _message_chars(message: dict[str, Any]) -> int:
+        size = len(message.get("content") or "")
+        for tool_call in message.get("tool_calls") or ():
+            size += len(tool_call["function"]["arguments"] or "")
+        return size
+
+    def _trim_conversation(self) -> None:
+        """Drop the oldest turns until the conversation fits the token budget.
+
+        Every LLM call resends the whole conversation, so without a cap the
+        prompt grows with each ReAct step. The system prompt, the first user
+        request and the newest message always stay. An assistant tool call is
+        dropped together with its tool results; the API rejects one without
+        the other.
+        """
+        conversation = self._conversation
+        budget = self.conversation_budget_tokens * CHARS_PER_TOKEN
+        size = sum(self._message_chars(message) for message in conversation)
+        if size <= budget:
+            return
+
+        head = 0
+        while head < len(conversation) and conversation[head]["role"] == "system":
+            head += 1
+        if head < len(conversation) and conversation[head]["role"] == "user":
+            head += 1
+
+        cut = head
+        while size > budget:
+            end = cut + 1
+            while end < len(conversation) and conversation[end]["role"] == "tool":
+                end += 1
+            if end >= len(conversation):
+                break
+            size -= sum(self._message_chars(message) for message in conversation[cut:end])
+            cut = end
+
+        if cut > head:
+            self._get_logger().info("✂️ Dropped %d old messages to fit the conversation budget", cut - head)
+            del conversation[head:cut]
+
     # ==================== Free-Form Answer Generation ====================
 
-    async def _generate_free_form_answer(self) -> str:
-        """Generate answer in free-form (no tool structure)."""
-        response = await self._client.chat.completions.create(
-            model=self.template_config.llm_policy.model,
-            messages=self._conversation,
-            temperature=self.template_config.llm_policy.temperature or 0.7,
-            max_tokens=self.template_config.llm_policy.max_tokens or 4096,
+    async def _free_form_answer_events(self, parts: list[str]) -> AsyncGenerator[SSEEvent, None]:
+        """Generate answer in free-form (no tool structure), collecting it in ``parts``.
+
+        With ``llm_policy.streaming`` the completion is streamed and every
+        delta is relayed as a message event as soon as it arrives. Otherwise
+        the answer comes back in one piece and nothing is yielded.
+        """
+        self._trim_conversation()
+        policy = self.template_config.llm_policy
+        request = {
+            "model": policy.model,
+            "messages": self._conversation,
+            "temperature": policy.temperature or 0.7,
+            "max_tokens": policy.max_tokens or 4096,
             # NO tools! Free-form response.
-        )
-        return response.choices[0].message.content or ""
+        }
+        if not policy.streaming:
+            response = await self._client.chat.completions.create(**request)
+            parts.append(response.choices[0].message.content or "")
+            return
 
-    async def _generate_free_form_answer_with_reasoning(self) -> str:
-        """Generate final answer with collected reasoning in context.
+        stream = await self._client.chat.completions.create(**request, stream=True)
+        async for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                parts.append(delta)
+                yield self.streaming_generator.text_delta(delta)
+
+    def _add_reasoning_context(self) -> None:
+        """Prepare the final answer with collected reasoning in context.
         
         This is the Two-Step SO pattern from research:
         1. Add reasoning as assistant message
@@ -539,16 +765,4 @@ class FlexibleToolCallingAgent(BaseAgent):
             "content": "Now provide the final answer to the original question. Be concise, accurate, and comprehensive."
         })
 
-        # Generate free-form answer (NO tools!)
-        response = await self._client.chat.completions.create(
-            model=self.template_config.llm_policy.model,
-            messages=self._conversation,
-            temperature=self.template_config.llm_policy.temperature or 0.7,
-            max_tokens=self.template_config.llm_policy.max_tokens or 4096,
-            # NO tools parameter!
-        )
-        
-        return response.choices[0].message.content or ""
-
-
 __all__ = ["FlexibleToolCallingAgent"]
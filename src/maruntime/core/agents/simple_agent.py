@@ -14,6 +14,8 @@ class SimpleAgent(BaseAgent):
 
     name = "simple_agent"
 
+    __slots__ = ()
+
     def __init__(self, task: str, toolkit=None, prompts_config=None, **kwargs) -> None:
         super().__init__(task=task, toolkit=toolkit or [EchoTool], prompts_config=prompts_config, **kwargs)
 
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import collections
 import json
 import logging
 import os
@@ -12,7 +13,6 @@ from typing import Any, AsyncGenerator, Type
 from openai import AsyncOpenAI
 
 from maruntime.core.agents.base_agent import BaseAgent
-from maruntime.core.llm import LLMClientFactory
 from maruntime.core.models import AgentContext, AgentStatesEnum
 from maruntime.core.streaming.openai_sse import SSEEvent
 from maruntime.core.tools.base_tool import BaseTool, PydanticTool
@@ -21,6 +21,9 @@ from maruntime.runtime import ChatMessage
 # Default logs directory
 LOGS_DIR = Path("./logs")
 
+# Tool executions kept in the in-memory diagnostic log
+EXECUTION_LOG_SIZE = 100
+
 
 def setup_session_logger(agent_name: str, session_id: str) -> logging.Logger:
     """Create a logger that writes to a session-specific file."""
@@ -80,6 +83,17 @@ class ToolCallingAgent(BaseAgent):
 
     name = "tool_calling_agent"
 
+    __slots__ = (
+        "max_iterations",
+        "_iteration",
+        "_finished",
+        "_client",
+        "_conversation",
+        "_agent_context",
+        "_log",
+        "_session_logger",
+    )
+
     def __init__(
         self,
         task: str,
@@ -95,8 +109,8 @@ class ToolCallingAgent(BaseAgent):
         self._conversation: list[dict[str, Any]] = []
         # Agent context for tools (not SessionContext)
         self._agent_context = AgentContext()
-        # Execution log for debugging/persistence
-        self._log: list[dict[str, Any]] = []
+        # Recent tool executions for debugging; long runs drop the oldest
+        self._log: collections.deque[dict[str, Any]] = collections.deque(maxlen=EXECUTION_LOG_SIZE)
         # Session-specific logger (initialized in run())
         self._session_logger: logging.Logger | None = None
 
@@ -221,8 +235,7 @@ class ToolCallingAgent(BaseAgent):
 
         # Initialize LLM client
         if self.template_config and self.template_config.llm_policy:
-            factory = LLMClientFactory()
-            self._client = factory.for_policy(self.template_config.llm_policy)
+            self._client = self._llm_client_factory.for_policy(self.template_config.llm_policy)
         else:
             self._get_logger().error("No LLM policy configured!")
             error_msg = "Error: No LLM configuration. Please configure llm_policy in template."
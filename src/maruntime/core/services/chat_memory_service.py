@@ -578,7 +578,11 @@ class ChatMemoryService:
               t.created_at,
               s.title AS session_title,
               (
-                0.80 * ts_rank_cd(t.search_tsv, params.tsq)
+                -- Weights are {D, C, B, A}. Assistant text (B) keeps the 0.1
+                -- every lexeme had before the vector was weighted, so scores
+                -- and min_score keep their scale; user text (A) ranks 2.5x
+                -- higher, the same A:B ratio as the built-in defaults.
+                0.80 * ts_rank_cd('{0.1, 0.2, 0.1, 0.25}'::float4[], t.search_tsv, params.tsq)
                 + 0.20 * similarity(t.search_text_norm, params.q_norm)
               ) AS score,
               ts_headline(
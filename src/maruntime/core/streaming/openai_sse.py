@@ -28,11 +28,19 @@ class OpenAIStreamingGenerator:
     def stream_text(self, text: str, chunk_size: int = 32) -> Iterable[SSEEvent]:
         chunks = [text[i : i + chunk_size] for i in range(0, len(text), chunk_size)] or [""]
         for chunk in chunks:
-            yield SSEEvent(
-                event="message",
-                data={"id": self.model, "object": "chat.completion.chunk", "model": self.model, "choices": [{"delta": {"content": chunk}}]},
-            )
-        yield SSEEvent(
+            yield self.text_delta(chunk)
+        yield self.done()
+
+    def text_delta(self, text: str) -> SSEEvent:
+        """Emit one chunk of answer text, e.g. a delta relayed from the LLM."""
+        return SSEEvent(
+            event="message",
+            data={"id": self.model, "object": "chat.completion.chunk", "model": self.model, "choices": [{"delta": {"content": text}}]},
+        )
+
+    def done(self) -> SSEEvent:
+        """Emit the end of the answer text."""
+        return SSEEvent(
             event="done",
             data={"id": self.model, "object": "chat.completion.chunk", "model": self.model, "choices": [{"delta": {"content": ""}}], "finish_reason": "stop"},
         )
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import os
 
 from fastapi import FastAPI
@@ -10,10 +12,11 @@ import maruntime.core.tools  # noqa: F401
 
 from maruntime.auth.middleware import AuthMiddleware
 from maruntime.auth.routes import create_auth_router
+from maruntime.auth.service import run_session_cleanup
 from maruntime.core.services.chat_memory_service import get_chat_memory_service
 from maruntime.gateway.routes import create_gateway_router
 from maruntime.observability import MetricsReporter
-from maruntime.persistence import create_engine, create_session_factory
+from maruntime.persistence import create_engine, create_session_factory, pooled_engine_options
 from maruntime.retrieval.agent_directory import AgentDirectoryService
 from maruntime.retrieval.tool_search import ToolSearchService
 from maruntime.runtime import SessionService, TemplateService
@@ -21,7 +24,9 @@ from maruntime.security import SecurityPolicy
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./dev.db")
 
-engine = create_engine(DATABASE_URL)
+# Every authenticated request checks its session in the DB, so keep a sized
+# pool of warm connections instead of reconnecting under load.
+engine = create_engine(DATABASE_URL, **pooled_engine_options(DATABASE_URL))
 session_factory = create_session_factory(engine)
 template_service = TemplateService(session_factory)
 session_service = SessionService(session_factory)
@@ -69,9 +74,25 @@ app.include_router(
 
 @app.get("/health")
 async def healthcheck() -> dict[str, str]:
-    return {"status": "ok"}
+    return {"status": "ok", "db_pool": engine.pool.status()}
+
+
+# Expired auth sessions are purged in the background instead of piling up
+# until someone calls cleanup_expired_sessions by hand.
+_session_cleanup_task: asyncio.Task | None = None
+
+
+@app.on_event("startup")
+async def _startup_event() -> None:
+    global _session_cleanup_task
+    _session_cleanup_task = asyncio.create_task(run_session_cleanup(session_factory))
 
 
 @app.on_event("shutdown")
 async def _shutdown_event() -> None:
+    if _session_cleanup_task is not None:
+        _session_cleanup_task.cancel()
+        # Let it return its connection before the pool goes away
+        with contextlib.suppress(asyncio.CancelledError):
+            await _session_cleanup_task
     await engine.dispose()
@@ -20,6 +20,7 @@ from .repositories import (
     ToolRepository,
     create_engine,
     create_session_factory,
+    pooled_engine_options,
 )
 
 __all__ = [
@@ -42,4 +43,5 @@ __all__ = [
     "ToolRepository",
     "create_engine",
     "create_session_factory",
+    "pooled_engine_options",
 ]
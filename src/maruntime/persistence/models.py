@@ -10,7 +10,20 @@ import uuid
 from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import JSON, BigInteger, Boolean, DateTime, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    UniqueConstraint,
+)
+from sqlalchemy.ext.mutable import MutableDict
 from sqlalchemy.orm import Mapped, declarative_base, mapped_column, relationship
 
 
@@ -57,7 +70,10 @@ class AgentTemplate(Base):
     )
 
     versions: Mapped[List["TemplateVersion"]] = relationship(
-        back_populates="template", cascade="all, delete-orphan", foreign_keys="TemplateVersion.template_id"
+        back_populates="template",
+        cascade="all, delete-orphan",
+        foreign_keys="TemplateVersion.template_id",
+        order_by="TemplateVersion.version",
     )
     active_version: Mapped[Optional["TemplateVersion"]] = relationship(
         "TemplateVersion", foreign_keys=[active_version_id], post_update=True
@@ -74,7 +90,8 @@ class TemplateVersion(Base):
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=_uuid_str)
     template_id: Mapped[str] = mapped_column(String(36), ForeignKey("agent_templates.id"), nullable=False)
     version: Mapped[int] = mapped_column(Integer, nullable=False)
-    settings: Mapped[dict] = mapped_column(JSON, default=dict)
+    # MutableDict tracks in-place top-level writes, so edits need no copy
+    settings: Mapped[dict] = mapped_column(MutableDict.as_mutable(JSON), default=dict)
     embedding: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
     prompt: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     tools: Mapped[list] = mapped_column(JSON, default=list)
@@ -98,7 +115,7 @@ class User(Base):
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=_uuid_str)
     login: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
-    password_hash: Mapped[str] = mapped_column(String(255), nullable=False)
+    password_hash: Mapped[bytes] = mapped_column(LargeBinary(255), nullable=False)
     display_name: Mapped[str] = mapped_column(String(100), nullable=False)
     about: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
@@ -120,8 +137,8 @@ class AuthSession(Base):
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=_uuid_str)
     user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    token_hash: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
-    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    token_hash: Mapped[str] = mapped_column(String(255), nullable=False, unique=True, index=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
 
     user: Mapped[User] = relationship("User", back_populates="auth_sessions")
@@ -129,6 +146,12 @@ class AuthSession(Base):
 
 class Session(Base):
     __tablename__ = "sessions"
+    # Serve the admin listing's filter + ORDER BY created_at DESC
+    __table_args__ = (
+        Index("ix_sessions_template_version_created", "template_version_id", "created_at"),
+        Index("ix_sessions_instance_created", "instance_id", "created_at"),
+        Index("ix_sessions_state_created", "state", "created_at"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=_uuid_str)
     template_version_id: Mapped[str] = mapped_column(
@@ -196,7 +219,13 @@ class ChatTurn(Base):
     __tablename__ = "chat_turns"
     __table_args__ = (UniqueConstraint("user_id", "chat_id", "turn_index", name="uq_chat_turns_order"),)
 
-    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    # On PostgreSQL the table is hash-partitioned by user_id, so its primary
+    # key is (id, user_id) (migration 006). id alone is still unique there, so
+    # the ORM keeps it as the identity; the INTEGER variant makes it a rowid
+    # alias, and thus autoincrementing, in SQLite schemas from create_all.
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True
+    )
     user_id: Mapped[str] = mapped_column(
         String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
     )
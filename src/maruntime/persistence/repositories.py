@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+import os
 from datetime import datetime
-from typing import Iterable, Optional, Sequence
+from typing import Any, Iterable, Mapping, Optional, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import Select, make_url, select
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
 from .models import (
@@ -22,8 +23,26 @@ from .models import (
 )
 
 
-def create_engine(url: str) -> AsyncEngine:
-    return create_async_engine(url, future=True)
+def create_engine(url: str, **engine_kwargs: Any) -> AsyncEngine:
+    return create_async_engine(url, future=True, **engine_kwargs)
+
+
+def pooled_engine_options(url: str) -> dict[str, Any]:
+    """Connection pool settings for long-running API processes.
+
+    SQLite keeps SQLAlchemy's default pool (in-memory URLs cannot take a
+    sized one); server databases get a bigger pool that survives restarts.
+    """
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "20")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "40")),
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+        # Reuse the most recently returned connection so idle ones can expire
+        "pool_use_lifo": True,
+    }
 
 
 def create_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
@@ -245,6 +264,11 @@ class SessionRepository:
         await self.session.flush()
         return message
 
+    async def add_messages(self, session_id: str, rows: Iterable[Mapping[str, Any]]) -> None:
+        """Insert several messages for one session with a single flush."""
+        self.session.add_all([SessionMessage(session_id=session_id, **row) for row in rows])
+        await self.session.flush()
+
     async def list_messages(self, session_id: str) -> Sequence[SessionMessage]:
         result = await self.session.scalars(
             select(SessionMessage).where(SessionMessage.session_id == session_id).order_by(SessionMessage.created_at)
@@ -418,6 +442,26 @@ class AgentInstanceRepository:
         auto_start: bool | None = None,
     ) -> Sequence[AgentInstance]:
         """List instances with optional filters."""
+        stmt = self.list_statement(
+            template_id=template_id,
+            template_version_id=template_version_id,
+            status=status,
+            is_enabled=is_enabled,
+            auto_start=auto_start,
+        )
+        result = await self.session.scalars(stmt)
+        return result.all()
+
+    @staticmethod
+    def list_statement(
+        *,
+        template_id: str | None = None,
+        template_version_id: str | None = None,
+        status: str | None = None,
+        is_enabled: bool | None = None,
+        auto_start: bool | None = None,
+    ) -> Select[tuple[AgentInstance]]:
+        """Build the filtered, ordered query behind ``list`` (e.g. for streaming)."""
         stmt = select(AgentInstance)
         if template_id:
             stmt = stmt.where(AgentInstance.template_id == template_id)
@@ -429,8 +473,7 @@ class AgentInstanceRepository:
             stmt = stmt.where(AgentInstance.is_enabled == is_enabled)
         if auto_start is not None:
             stmt = stmt.where(AgentInstance.auto_start == auto_start)
-        result = await self.session.scalars(stmt.order_by(AgentInstance.priority.desc(), AgentInstance.name))
-        return result.all()
+        return stmt.order_by(AgentInstance.priority.desc(), AgentInstance.name)
 
     async def update(
         self,
@@ -163,6 +163,20 @@ class SessionService:
             )
             await session.commit()
 
+    async def save_agent_steps(self, session_id: str, steps: Iterable[Mapping[str, Any]]) -> None:
+        """Save a batch of agent step events in one transaction.
+
+        Each step mapping carries ``message_type``, ``step_number``, ``step_data``
+        and, optionally, ``created_at`` and ``role``.
+        """
+        rows = [{"role": "system", "content": {}, **step} for step in steps]
+        if not rows:
+            return
+        async with self._session_factory() as session:
+            repo = SessionRepository(session)
+            await repo.add_messages(session_id, rows)
+            await session.commit()
+
     async def update_context(self, session_id: str, context: dict[str, Any]) -> SessionContext:
         async with self._session_factory() as session:
             repo = SessionRepository(session)
@@ -204,7 +204,13 @@ class TemplateService:
         activate: bool = False,
         rules: Optional[Sequence[dict[str, Any]]] = None,
         embedding_text: Optional[str] = None,
+        session: Optional[AsyncSession] = None,
     ) -> TemplateVersion:
+        """Create a template version.
+
+        When ``session`` is given the version is only flushed into it and the
+        caller owns the commit; otherwise a session is opened and committed.
+        """
         llm_policy_model = self._as_model(LLMPolicy, llm_policy)
         prompts_model = self._as_model(PromptConfig, prompts) if prompts is not None else PromptConfig()
         execution_policy_model = (
@@ -224,17 +230,20 @@ class TemplateService:
             "rules": list(rules or []),
         }
 
+        version_fields = dict(
+            version=version,
+            settings=settings,
+            embedding=embedding_vector,
+            prompt=prompt or prompts_model.system,
+            tools=list(tools) if tools is not None else [],
+            is_active=activate,
+        )
+        if session is not None:
+            return await TemplateRepository(session).create_version(template_id, **version_fields)
+
         async with self._session_factory() as session:
             repo = TemplateRepository(session)
-            template_version = await repo.create_version(
-                template_id,
-                version=version,
-                settings=settings,
-                embedding=embedding_vector,
-                prompt=prompt or prompts_model.system,
-                tools=list(tools) if tools is not None else [],
-                is_active=activate,
-            )
+            template_version = await repo.create_version(template_id, **version_fields)
             await session.commit()
             return template_version
 
@@ -57,7 +57,7 @@ async def pg_test_user(pg_session_factory) -> str:
         user = User(
             id=user_id,
             login=f"test_{user_id[:8]}@test.com",
-            password_hash="$2b$12$test",
+            password_hash=b"$2b$12$test",
             display_name="Test User",
         )
         session.add(user)
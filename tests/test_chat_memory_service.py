@@ -25,7 +25,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from maruntime.core.services.chat_memory_service import ChatMemoryService
-from maruntime.persistence import TemplateRepository
+from maruntime.persistence import Base, TemplateRepository
 from maruntime.persistence.models import ChatTurn, Session, User
 
 
@@ -44,7 +44,7 @@ async def _setup_session(session_factory: async_sessionmaker) -> tuple[str, str]
         user = User(
             id=user_id,
             login=f"user_{user_id[:8]}@example.com",
-            password_hash="hash",
+            password_hash=b"hash",
             display_name="User",
         )
         session_id = str(uuid.uuid4())
@@ -210,6 +210,39 @@ async def test_chat_memory_service_search_postgres_trigram(pg_session_factory, t
     assert results, "Should find results with trigram similarity"
 
 
+# =============================================================================
+# SQLite Tests (schema from Base.metadata.create_all)
+# =============================================================================
+
+@pytest.mark.anyio
+async def test_chat_memory_service_persists_turns_sqlite(tmp_path: Path) -> None:
+    """Test that turns get a generated id in a create_all SQLite schema."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'chat.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    user_id, session_id = await _setup_session(session_factory)
+
+    async with session_factory() as session:
+        session.add(ChatTurn(user_id=user_id, chat_id=session_id, turn_index=0, user_text="Hello"))
+        await session.commit()
+
+    chat_memory = ChatMemoryService(base_dir=str(tmp_path / "memory"), session_factory=session_factory)
+    await chat_memory.save_message(user_id=user_id, session_id=session_id, role="user", content="Second")
+
+    async with session_factory() as session:
+        result = await session.execute(
+            select(ChatTurn).where(ChatTurn.user_id == user_id).order_by(ChatTurn.turn_index)
+        )
+        turns = result.scalars().all()
+
+    assert [turn.user_text for turn in turns] == ["Hello", "Second"]
+    assert all(turn.id is not None for turn in turns)
+    assert len({turn.id for turn in turns}) == 2
+
+    await engine.dispose()
+
+
 # =============================================================================
 # File-based Tests (work without database)
 # =============================================================================
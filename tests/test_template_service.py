@@ -4,7 +4,7 @@ import sqlite3
 import pytest
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
-from maruntime.persistence import TemplateRepository
+from maruntime.persistence import Base, TemplateRepository
 from maruntime.runtime import (
     ExecutionPolicy,
     LLMPolicy,
@@ -85,3 +85,32 @@ async def test_template_service_create_and_activate(tmp_path: Path) -> None:
         }
 
     await engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_template_service_create_version_in_caller_session(tmp_path: Path) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'templates.db'}", future=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory: async_sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    service = TemplateService(session_factory)
+
+    async with session_factory() as session:
+        template = await TemplateRepository(session).create_template(name="analyst")
+        version = await service.create_version(
+            template.id,
+            llm_policy=LLMPolicy(model="gpt-4o"),
+            activate=True,
+            session=session,
+        )
+
+        async with session_factory() as other:
+            assert await TemplateRepository(other).list_versions(template.id) == []
+
+        await session.commit()
+
+    active_config = await service.get_active(template.id)
+    assert active_config is not None
+    assert active_config.version_id == version.id
+
+    await engine.dispose()
@@ -20,6 +20,7 @@ async def run_migrations(db_path: Path) -> None:
     cfg = Config(str(ALEMBIC_INI))
     cfg.set_main_option("script_location", str(ALEMBIC_SCRIPT))
     cfg.set_main_option("sqlalchemy.url", f"sqlite+aiosqlite:///{db_path}")
+    cfg.attributes["configure_logger"] = False
     loop = asyncio.get_event_loop()
     if loop.is_running():
         await loop.run_in_executor(None, command.upgrade, cfg, "head")